@@ -0,0 +1,14 @@
+"""
+Shared import bootstrap for the scripts in this directory.
+
+Puts the project root on sys.path exactly once, so `src` and `scripts`
+are importable no matter which directory a script is launched from.
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
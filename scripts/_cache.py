@@ -0,0 +1,120 @@
+"""
+On-disk cache for feature and regime artifacts shared by the analysis scripts.
+
+Responsibilities:
+- Delegate feature caching to build_features(cache_dir=...), the same cache the
+  main entry points use (data/processed/cache/features/), keyed on the data,
+  FEATURE_VERSION and the src/features source
+- Key regimes on (data file mtime, FEATURE_VERSION, features/regimes package
+  source, inference kwargs)
+- Store regimes as Parquet under data/processed/cache/regimes/<hash>.parquet
+- Rebuild transparently when the key changes
+- Memoize loaded artifacts in-process so repeated calls in one session skip disk
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from src.features.builder import FEATURE_VERSION, build_features
+from src.regimes.inference import rolling_inference
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_ROOT = PROJECT_ROOT / "data" / "processed" / "cache"
+FEATURE_CACHE_DIR = CACHE_ROOT / "features"
+REGIME_CACHE_DIR = CACHE_ROOT / "regimes"
+
+# Packages whose code determines the cached regimes (the features feed them);
+# any edit to a module in them (builders, kernels, HMM) yields a new regime key.
+# build_features hashes src/features the same way for its own cache
+_SOURCE_DIRS = [PROJECT_ROOT / "src" / "features", PROJECT_ROOT / "src" / "regimes"]
+
+# Kwargs that only affect console output, not the cached result
+_IGNORED_KWARGS = {"verbose"}
+
+# In-process memo of (features, regimes) by cache key, oldest entry evicted first
+_MEMO: dict[str, tuple[pd.DataFrame, pd.DataFrame | None]] = {}
+_MEMO_MAXSIZE = 8
+
+
+def _cache_key(data_path: str | Path, inference_kwargs: dict | None) -> str:
+    kwargs = {
+        k: v for k, v in (inference_kwargs or {}).items()
+        if k not in _IGNORED_KWARGS
+    }
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(Path(data_path).stat().st_mtime_ns).encode())
+    h.update(FEATURE_VERSION.encode())
+    for source_dir in _SOURCE_DIRS:
+        for path in sorted(source_dir.glob("*.py")):
+            h.update(path.name.encode())
+            h.update(path.read_bytes())
+    h.update(json.dumps(kwargs, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def get_or_build(
+    df: pd.DataFrame,
+    data_path: str | Path,
+    inference_kwargs: dict | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame | None]:
+    """
+    Return (features, regimes) for `df`, loading them from the cache if present.
+
+    Features are returned as float32 with NaN rows dropped. If `inference_kwargs` is None,
+    no regime inference is run and `regimes` is None. If `data_path` does not
+    exist (e.g. synthetic data), nothing is cached.
+
+    Within one session, repeated calls with the same key return the same
+    objects without touching disk, so callers must not modify them in place.
+
+    Args:
+        df: OHLCV DataFrame loaded from `data_path`
+        data_path: Source file of `df`, used to invalidate the cache
+        inference_kwargs: Keyword arguments forwarded to rolling_inference
+    """
+    if not Path(data_path).exists():
+        features = build_features(df)
+        features.dropna(inplace=True)
+        if inference_kwargs is None:
+            return features, None
+        return features, rolling_inference(features, **inference_kwargs)
+
+    key = _cache_key(data_path, inference_kwargs)
+    if key in _MEMO:
+        return _MEMO[key]
+
+    features = build_features(df, cache_dir=FEATURE_CACHE_DIR)
+    features.dropna(inplace=True)
+
+    if inference_kwargs is None:
+        return _remember(key, features, None)
+
+    regimes_path = REGIME_CACHE_DIR / f"{key}.parquet"
+    if regimes_path.exists():
+        regimes = pd.read_parquet(regimes_path, engine="pyarrow")
+    else:
+        regimes = rolling_inference(features, **inference_kwargs)
+        REGIME_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Same temp-file-and-rename write as the feature cache, so a concurrent
+        # script never reads a partial file
+        tmp_path = regimes_path.with_name(f"{regimes_path.name}.{os.getpid()}.tmp")
+        regimes.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+        tmp_path.replace(regimes_path)
+
+    return _remember(key, features, regimes)
+
+
+def _remember(
+    key: str,
+    features: pd.DataFrame,
+    regimes: pd.DataFrame | None,
+) -> tuple[pd.DataFrame, pd.DataFrame | None]:
+    if len(_MEMO) >= _MEMO_MAXSIZE:
+        _MEMO.pop(next(iter(_MEMO)))
+    _MEMO[key] = (features, regimes)
+    return features, regimes
@@ -1,17 +1,16 @@
-import sys
-from pathlib import Path
-import pandas as pd
 import numpy as np
 from sklearn.decomposition import PCA
 from sklearn.preprocessing import StandardScaler
-import matplotlib.pyplot as plt
 
-# Add project root to path
-project_root = Path.cwd()
-sys.path.append(str(project_root))
+# Run as a script, scripts/ is sys.path[0]; imported as scripts.<name>, the
+# project root already is
+try:
+    from _bootstrap import PROJECT_ROOT as project_root
+except ModuleNotFoundError:
+    from scripts._bootstrap import PROJECT_ROOT as project_root
 
 from src.data.loader import load_ohlcv_csv
-from src.features.builder import build_features
+from scripts._cache import get_or_build
 
 def analyze_pca():
     print("Loading data...")
@@ -24,8 +23,7 @@ def analyze_pca():
     print(f"Data loaded: {len(df)} rows")
 
     print("Building features...")
-    features = build_features(df)
-    features.dropna(inplace=True)
+    features, _ = get_or_build(df, data_path)
     print(f"Features shape: {features.shape}")
 
     # Standardize features
@@ -33,7 +31,9 @@ def analyze_pca():
     X_scaled = scaler.fit_transform(features)
 
     # Run PCA
-    pca = PCA()
+    # Eigendecomposition of the p x p covariance is much cheaper than a full SVD
+    # on the tall (n_samples x n_features) matrix and yields the same variances.
+    pca = PCA(svd_solver="covariance_eigh")
     pca.fit(X_scaled)
 
     explained_variance = pca.explained_variance_ratio_
@@ -44,19 +44,17 @@ def analyze_pca():
     print(f"{'Components':<12} | {'Explained Var':<15} | {'Cumulative':<15}")
     print("-" * 50)
     
-    thresholds = {0.8: None, 0.9: None, 0.95: None}
-    
     for i, (ev, cv) in enumerate(zip(explained_variance, cumulative_variance)):
         n = i + 1
         print(f"{n:<12} | {ev:.4f}          | {cv:.4f}")
-        
-        for t in thresholds:
-            if thresholds[t] is None and cv >= t:
-                thresholds[t] = n
+
+    # Smallest number of components whose cumulative variance reaches each threshold
+    ts = np.array([0.8, 0.9, 0.95])
+    ns = np.searchsorted(cumulative_variance, ts) + 1
 
     print("-" * 50)
     print("\nRecommendations:")
-    for t, n in thresholds.items():
+    for t, n in zip(ts, ns):
         print(f"For {t*100}% variance: Use {n} components")
 
 if __name__ == "__main__":
@@ -1,16 +1,16 @@
-import sys
-from pathlib import Path
 import pandas as pd
 import numpy as np
 
-# Add project root to path
-project_root = Path(__file__).resolve().parent.parent
-sys.path.append(str(project_root))
+# Run as a script, scripts/ is sys.path[0]; imported as scripts.<name>, the
+# project root already is
+try:
+    from _bootstrap import PROJECT_ROOT as project_root
+except ModuleNotFoundError:
+    from scripts._bootstrap import PROJECT_ROOT as project_root
 
 from src.data.loader import load_ohlcv_csv
-from src.features.builder import build_features
-from src.regimes.inference import rolling_inference
 from src.regimes.diagnostics import compute_regime_stats
+from scripts._cache import get_or_build
 
 def run_analysis():
     # 1. Load Data
@@ -29,16 +29,9 @@ def run_analysis():
         df['high'] = df[['open', 'close']].max(axis=1) + 10
         df['low'] = df[['open', 'close']].min(axis=1) - 10
 
-    # 2. Build Features
-    print("Building features...")
-    features = build_features(df)
-    features.dropna(inplace=True)
-    df = df.loc[features.index]
-    
-    # 3. Run Inference with SORTING
-    print("Running rolling inference (refit_interval=10, sort_by='rolling_std_medium')...")
-    regimes = rolling_inference(
-        features,
+    # 2. Build Features & 3. Run Inference with SORTING (cached)
+    print("Building features and running rolling inference (refit_interval=10, sort_by='rolling_std_medium')...")
+    inference_kwargs = dict(
         n_components=3,
         window=512,
         covariance_type="full",
@@ -48,6 +41,7 @@ def run_analysis():
         sort_by="rolling_std_medium", # <--- CRITICAL FIX
         verbose=True
     )
+    features, regimes = get_or_build(df, data_path, inference_kwargs)
     
     df_regimes = regimes.dropna()
     
@@ -1,100 +1,115 @@
-import sys
-from pathlib import Path
 import pandas as pd
 import numpy as np
 from typing import List, Dict
 
-# Add project root to path
-project_root = Path(__file__).resolve().parent.parent
-sys.path.append(str(project_root))
+# Run as a script, scripts/ is sys.path[0]; imported as scripts.<name>, the
+# project root already is
+try:
+    from _bootstrap import PROJECT_ROOT as project_root
+except ModuleNotFoundError:
+    from scripts._bootstrap import PROJECT_ROOT as project_root
 
 from src.data.loader import load_ohlcv_csv
-from src.features.builder import build_features
-from src.regimes.inference import rolling_inference
 from src.strategies.trend import RegimeTrendStrategy
 from src.strategies.mean_reversion import MeanReversionStrategy
 from src.strategies.robust import RobustTrendStrategy
+from src.utils.jit import njit, NUMBA_AVAILABLE
+from scripts._cache import get_or_build
 
-def get_trades_from_signals(df: pd.DataFrame, signals: pd.Series, fee_rate: float = 0.0005) -> pd.DataFrame:
+@njit(cache=True)
+def _extract_trades_nb(pos, price, fee_rate):
     """
-    Reconstruct trades from a series of position signals.
-    signals: Series of -1, 0, 1 (target position)
+    State-machine trade extraction over plain arrays (Numba kernel).
+    Returns (entry_idx, exit_idx, side, net_ret, raw_ret).
+    """
+    n = len(pos)
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    side = np.empty(n, dtype=np.float64)
+    
+    n_trades = 0
+    active = False
+    active_side = 0.0
+    active_entry = 0
+    
+    for i in range(n):
+        s = pos[i]
+        
+        # Close (or flip) the active trade
+        if active and s != active_side:
+            entry_idx[n_trades] = active_entry
+            exit_idx[n_trades] = i
+            side[n_trades] = active_side
+            n_trades += 1
+            active = False
+        
+        # Open a new trade
+        if not active and s != 0:
+            active = True
+            active_side = s
+            active_entry = i
+    
+    entry_idx = entry_idx[:n_trades]
+    exit_idx = exit_idx[:n_trades]
+    side = side[:n_trades]
+    
+    entry_price = price[entry_idx]
+    exit_price = price[exit_idx]
+    raw_ret = (exit_price - entry_price) / entry_price * side
+    net_ret = raw_ret - (2 * fee_rate) # Entry + Exit fee
+    
+    return entry_idx, exit_idx, side, net_ret, raw_ret
+
+def _extract_trades_np(pos: np.ndarray, price: np.ndarray, fee_rate: float):
     """
-    trades = []
+    Vectorized trade extraction (NumPy fallback when numba is unavailable).
+    Returns (entry_idx, exit_idx, side, net_ret, raw_ret).
+    """
+    # A trade is a maximal run of a constant non-zero position.
+    # Every index where the position changes closes the previous run (if any)
+    # and opens a new one (if non-zero). Flips (1 -> -1) are therefore treated
+    # as Close Long + Open Short at the same bar.
+    change = np.flatnonzero(np.diff(pos, prepend=0.0) != 0)
     
-    # Ensure signals are aligned and filled
-    pos = signals.fillna(0)
-    pos_diff = pos.diff().fillna(0)
+    # A run that is still open at the end of the data has no exit and is dropped
+    opens_trade = pos[change[:-1]] != 0
+    entry_idx = change[:-1][opens_trade]
+    exit_idx = change[1:][opens_trade]
     
-    # Iterate through changes
-    # This is a simple state machine to capture trades
-    # Note: This handles simple Long/Short/Flat. 
-    # Flips (1 -> -1) are treated as Close Long + Open Short.
+    side = pos[entry_idx]
+    entry_price = price[entry_idx]
+    exit_price = price[exit_idx]
     
-    current_trade = {}
+    raw_ret = (exit_price - entry_price) / entry_price * side
+    net_ret = raw_ret - (2 * fee_rate) # Entry + Exit fee
     
-    price = df['close']
+    return entry_idx, exit_idx, side, net_ret, raw_ret
+
+def get_trades_from_signals(df: pd.DataFrame, signals: pd.Series, fee_rate: float = 0.0005) -> pd.DataFrame:
+    """
+    Reconstruct trades from a series of position signals.
+    signals: Series of -1, 0, 1 (target position)
+    """
+    # Ensure signals are aligned and filled
+    pos = signals.fillna(0).to_numpy(dtype=np.float64)
+    price = df['close'].to_numpy(dtype=np.float64)
     times = df.index
     
-    # We need to loop. Vectorizing trade extraction is hard.
-    # pos[i] is the target position held FROM t[i] TO t[i+1]
-    # The decision is made at t[i] based on data up to t[i]
-    # Execution happens at t[i] (assuming close price execution for simplicity, 
-    # or we can assume next open, but backtester used close)
-    
-    # Backtester logic:
-    # data['signal'] = signals.shift(1)  <-- signal calculated at t-1 applies to t
-    # strategy_returns = pct_change(t) * signal(t)
-    # This means we hold position from Open(t) to Close(t) effectively if using Close-to-Close returns
-    # Let's align with that.
-    
-    # Position at time t
-    position = pos.shift(1).fillna(0) # This is what we hold during bar t
-    
-    # Find where position changes
-    # If position[t] != position[t-1], a trade happened at t-1 close / t open
-    
-    # Let's use the raw signals (unshifted) which represent "Target Position after bar t closes"
-    # So if signal[t] = 1, we buy at Close[t]
-    
-    active_trade = None
-    
-    for i in range(len(df)):
-        t = times[i]
-        p = price.iloc[i]
-        s = pos.iloc[i]
-        
-        # Check if we need to close or flip
-        if active_trade is not None:
-            if s != active_trade['type']:
-                # Close the trade
-                exit_price = p
-                entry_price = active_trade['entry_price']
-                side = active_trade['type'] # 1 or -1
-                
-                raw_ret = (exit_price - entry_price) / entry_price * side
-                net_ret = raw_ret - (2 * fee_rate) # Entry + Exit fee
-                
-                trades.append({
-                    'entry_time': active_trade['entry_time'],
-                    'exit_time': t,
-                    'type': 'Long' if side == 1 else 'Short',
-                    'entry_price': entry_price,
-                    'exit_price': exit_price,
-                    'return': net_ret,
-                    'raw_return': raw_ret
-                })
-                active_trade = None
-        
-        # Check if we need to open
-        if active_trade is None and s != 0:
-            active_trade = {
-                'entry_time': t,
-                'entry_price': p,
-                'type': s
-            }
-            
-    return pd.DataFrame(trades)
+    # Signal semantics (unshifted): signal[t] is the "Target Position after bar t closes",
+    # so if signal[t] = 1, we buy at Close[t]. This matches the backtester, which
+    # shifts the signal by one bar before applying it to close-to-close returns.
+    extract = _extract_trades_nb if NUMBA_AVAILABLE else _extract_trades_np
+    entry_idx, exit_idx, side, net_ret, raw_ret = extract(pos, price, fee_rate)
+    
+    return pd.DataFrame({
+        'entry_time': times[entry_idx],
+        'exit_time': times[exit_idx],
+        'type': np.where(side > 0, 'Long', 'Short'),
+        'entry_price': price[entry_idx],
+        'exit_price': price[exit_idx],
+        'return': net_ret,
+        'raw_return': raw_ret
+    })
 
 def print_trade_stats(name: str, trades: pd.DataFrame):
     print(f"\n--- Strategy: {name} ---")
@@ -102,25 +117,31 @@ def print_trade_stats(name: str, trades: pd.DataFrame):
         print("No trades executed.")
         return
 
-    n_trades = len(trades)
-    win_rate = (trades['return'] > 0).mean()
-    avg_ret = trades['return'].mean()
-    avg_raw_ret = trades['raw_return'].mean()
-    cum_ret = (1 + trades['return']).prod() - 1
+    # Pull the columns out once and compute every stat on plain arrays
+    ret = trades['return'].to_numpy()
+    raw = trades['raw_return'].to_numpy()
+    typ = trades['type'].to_numpy()
+    duration = (trades['exit_time'] - trades['entry_time']).to_numpy()
+    
+    n_trades = len(ret)
+    win_rate = (ret > 0).mean()
+    avg_ret = ret.mean()
+    avg_raw_ret = raw.mean()
+    cum_ret = np.prod(1 + ret) - 1
     
     print(f"Number of Trades: {n_trades}")
     print(f"Win Rate:         {win_rate*100:.2f}%")
     print(f"Avg Net Return:   {avg_ret*100:.4f}%")
     print(f"Avg Raw Return:   {avg_raw_ret*100:.4f}%")
     print(f"Cum Return (Appx):{cum_ret*100:.2f}%")
-    print(f"Avg Duration:     {trades['exit_time'].sub(trades['entry_time']).mean()}")
+    print(f"Avg Duration:     {pd.Timedelta(duration.mean())}")
     
     # Long vs Short
-    longs = trades[trades['type'] == 'Long']
-    shorts = trades[trades['type'] == 'Short']
-    
-    print(f"Longs: {len(longs)} | Win: {(longs['return']>0).mean()*100:.1f}% | Avg Raw: {longs['raw_return'].mean()*100:.4f}%")
-    print(f"Shorts: {len(shorts)} | Win: {(shorts['return']>0).mean()*100:.1f}% | Avg Raw: {shorts['raw_return'].mean()*100:.4f}%")
+    for label, mask in (("Longs", typ == 'Long'), ("Shorts", typ == 'Short')):
+        n = int(mask.sum())
+        win = (ret[mask] > 0).mean() if n else np.nan
+        avg_raw = raw[mask].mean() if n else np.nan
+        print(f"{label}: {n} | Win: {win*100:.1f}% | Avg Raw: {avg_raw*100:.4f}%")
 
 def run_debug():
     # 1. Load Data
@@ -128,16 +149,10 @@ def run_debug():
     print("Loading data...")
     df = load_ohlcv_csv(data_path)
     
-    print("Building features...")
-    features = build_features(df)
-    features.dropna(inplace=True)
-    df = df.loc[features.index]
-    
-    # 3. Run Inference (Fast settings for debug, but consistent with backtest logic)
+    # 2. Build Features & 3. Run Inference (Fast settings for debug, but consistent with backtest logic)
     # To save time, we can use the parameters from the failing backtest
-    print("Running inference...")
-    regimes = rolling_inference(
-        features,
+    print("Building features and running inference...")
+    inference_kwargs = dict(
         n_components=3,
         window=512,
         covariance_type="full",
@@ -146,6 +161,7 @@ def run_debug():
         sort_by="rolling_std_medium",
         verbose=True
     )
+    features, regimes = get_or_build(df, data_path, inference_kwargs)
     
     df = df.loc[regimes.index]
     regime_col = regimes['regime']
@@ -1,18 +1,17 @@
-import sys
 import pandas as pd
 import numpy as np
-from pathlib import Path
 
-# Add project root to path
-project_root = Path(__file__).resolve().parent.parent
-if str(project_root) not in sys.path:
-    sys.path.append(str(project_root))
+# Run as a script, scripts/ is sys.path[0]; imported as scripts.<name>, the
+# project root already is
+try:
+    import _bootstrap
+except ModuleNotFoundError:
+    import scripts._bootstrap
 
 from src.data.loader import load_ohlcv_csv
 from src.data.cleaner import clean_ohlcv
-from src.features.builder import build_features
-from src.regimes.inference import rolling_inference
 from src.utils.logging import setup_logger
+from scripts._cache import get_or_build
 
 logger = setup_logger("diagnose")
 
@@ -29,18 +28,16 @@ def run_diagnostics():
 
     # 2. Features & Regimes
     logger.info("Building features and running regime inference...")
-    features = build_features(df)
-    features.dropna(inplace=True)
-    df = df.loc[features.index]
 
-    regime_df = rolling_inference(
-        features, 
+    inference_kwargs = dict(
         window=1000, 
         refit_interval=100, 
         n_components=3, 
         sort_by='rolling_std_medium'
     )
-    df = df.join(regime_df)
+    features, regime_df = get_or_build(df, data_path, inference_kwargs)
+    # Align with features and attach regimes in a single inner join
+    df = df.join(regime_df, how='inner')
 
     # 3. Calculate Stats for Each Regime
     print("\n" + "="*50)
@@ -49,21 +46,21 @@ def run_diagnostics():
     print(f"{'Regime':<10} | {'Ann. Volatility':<15} | {'Ann. Mean Return':<15} | {'Count':<10}")
     print("-" * 60)
 
+    # Log returns over the full frame (one pass), then per-regime stats in one groupby
+    df['log_ret'] = np.log(df['close']).diff()
+    g = df.groupby('regime')['log_ret'].agg(['std', 'mean', 'size'])
+    
+    # 6 * 365 = 2190 candles per year
+    g['ann_vol'] = g['std'] * np.sqrt(2190)
+    g['ann_ret'] = g['mean'] * 2190
+
     for r in [0, 1, 2]:
-        subset = df[df['regime'] == r].copy()
-        if len(subset) == 0:
+        if r not in g.index:
             print(f"Regime {r}   | N/A             | N/A             | 0")
             continue
         
-        # Calculate Log Returns if not present (build_features might not have simple log_ret)
-        subset['log_ret'] = np.log(subset['close'] / subset['close'].shift(1))
-        
-        # Calculate Volatility (std of returns) and Mean Return
-        # 6 * 365 = 2190 candles per year
-        vol = subset['log_ret'].std() * np.sqrt(2190) 
-        mean_ret = subset['log_ret'].mean() * 2190    
-        
-        print(f"Regime {r:<4} | {vol*100:>14.1f}% | {mean_ret*100:>14.1f}% | {len(subset):<10}")
+        row = g.loc[r]
+        print(f"Regime {r:<4} | {row['ann_vol']*100:>14.1f}% | {row['ann_ret']*100:>14.1f}% | {int(row['size']):<10}")
     
     print("="*50 + "\n")
 
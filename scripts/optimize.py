@@ -1,26 +1,58 @@
-import sys
 import pandas as pd
 import numpy as np
 import itertools
-from pathlib import Path
+from joblib import Parallel, delayed
 
-# Add project root to path
-project_root = Path(__file__).resolve().parent.parent
-if str(project_root) not in sys.path:
-    sys.path.append(str(project_root))
+# Run as a script, scripts/ is sys.path[0]; imported as scripts.<name>, the
+# project root already is
+try:
+    import _bootstrap
+except ModuleNotFoundError:
+    import scripts._bootstrap
 
 from src.data.loader import load_ohlcv_csv
 from src.data.cleaner import clean_ohlcv
-from src.features.builder import build_features
-from src.regimes.inference import rolling_inference
 from src.strategies.robust import RobustTrendStrategy
-from src.risk.sizing import apply_vol_targeting
+from src.risk.sizing import apply_vol_targeting, compute_realized_vol
 from src.risk.limits import RiskLimits
 from src.backtest.engine import BacktestEngine
 from src.utils.logging import setup_logger
+from scripts._cache import get_or_build
 
 logger = setup_logger("optimizer")
 
+def _eval(tv: float, ml: float, raw_signals: pd.Series, close: np.ndarray, realized_vol: np.ndarray, df: pd.DataFrame, backtester: BacktestEngine) -> dict:
+    """
+    Evaluate a single (target_vol, max_leverage) grid cell.
+    """
+    # Apply Vol Targeting (rolling vol is shared across the sweep, only the scalar changes)
+    sig_vol = apply_vol_targeting(
+        raw_signals, 
+        close, 
+        target_annual_vol=tv, 
+        window_days=20,
+        max_leverage=ml,
+        realized_vol=realized_vol
+    )
+    
+    # Apply Limits
+    risk_limits = RiskLimits(max_leverage=ml, max_position_size=ml)
+    sig_final = risk_limits.apply_limits(sig_vol)
+    
+    # Run Backtest (the engine is stateless across runs, so it is shared)
+    res = backtester.run(df, sig_final)
+    m = res['metrics']
+    
+    return {
+        'target_vol': tv,
+        'max_leverage': ml,
+        'cagr': m['cagr'],
+        'sharpe': m['sharpe_ratio'],
+        'max_dd': m['max_drawdown'],
+        'calmar': m['calmar_ratio'],
+        'total_ret': m['total_return']
+    }
+
 def run_grid_search():
     # 1. Load and Prep Data (Once)
     data_path = "data/raw/btc_4h.csv"
@@ -34,19 +66,17 @@ def run_grid_search():
 
     # 2. Features & Regimes (Once)
     logger.info("Building features and running regime inference...")
-    features = build_features(df)
-    features.dropna(inplace=True)
-    df = df.loc[features.index]
 
     # Use standard window/refit for optimization
-    regime_df = rolling_inference(
-        features, 
+    inference_kwargs = dict(
         window=1000, 
         refit_interval=100, 
         n_components=3, 
         sort_by='rolling_std_medium'
     )
-    df = df.join(regime_df)
+    features, regime_df = get_or_build(df, data_path, inference_kwargs)
+    # Align with features and attach regimes in a single inner join
+    df = df.join(regime_df, how='inner')
 
     # 3. Generate Raw Signals (Once)
     logger.info("Generating raw strategy signals...")
@@ -68,49 +98,28 @@ def run_grid_search():
     target_vols = [0.4, 0.5, 0.6, 0.7, 0.8, 1.0]
     max_leverages = [1.0, 2.0, 3.0, 4.0, 5.0]
     
-    results = []
-
     logger.info(f"Starting Grid Search over {len(target_vols) * len(max_leverages)} combinations...")
     
+    # Loop-invariant inputs, built once for the whole grid
+    backtester = BacktestEngine(
+        initial_capital=10000.0, 
+        fee_rate=0.0005, 
+        idle_apy=0.06
+    )
+    close_np = df['close'].to_numpy(dtype=np.float64)
+    realized_vol = compute_realized_vol(close_np, window_days=20)
+    
+    # Each cell is independent pure-CPU work, so fan out across all cores
+    results = Parallel(n_jobs=-1, backend="loky", batch_size=4)(
+        delayed(_eval)(tv, ml, raw_signals, close_np, realized_vol, df, backtester)
+        for tv, ml in itertools.product(target_vols, max_leverages)
+    )
+    
     print(f"{'Target Vol':<12} | {'Max Lev':<10} | {'CAGR':<8} | {'Sharpe':<8} | {'Max DD':<8} | {'Calmar':<8}")
     print("-" * 75)
-
-    for tv in target_vols:
-        for ml in max_leverages:
-            # Apply Vol Targeting
-            sig_vol = apply_vol_targeting(
-                raw_signals, 
-                df['close'], 
-                target_annual_vol=tv, 
-                window_days=20,
-                max_leverage=ml
-            )
-            
-            # Apply Limits
-            risk_limits = RiskLimits(max_leverage=ml, max_position_size=ml)
-            sig_final = risk_limits.apply_limits(sig_vol)
-            
-            # Run Backtest
-            backtester = BacktestEngine(
-                initial_capital=10000.0, 
-                fee_rate=0.0005, 
-                idle_apy=0.06
-            )
-            res = backtester.run(df, sig_final)
-            m = res['metrics']
-            
-            # Store result
-            results.append({
-                'target_vol': tv,
-                'max_leverage': ml,
-                'cagr': m['cagr'],
-                'sharpe': m['sharpe_ratio'],
-                'max_dd': m['max_drawdown'],
-                'calmar': m['calmar_ratio'],
-                'total_ret': m['total_return']
-            })
-            
-            print(f"{tv:<12.2f} | {ml:<10.1f} | {m['cagr']*100:>7.1f}% | {m['sharpe_ratio']:>8.2f} | {m['max_drawdown']*100:>7.1f}% | {m['calmar_ratio']:>8.2f}")
+    
+    for r in results:
+        print(f"{r['target_vol']:<12.2f} | {r['max_leverage']:<10.1f} | {r['cagr']*100:>7.1f}% | {r['sharpe']:>8.2f} | {r['max_dd']*100:>7.1f}% | {r['calmar']:>8.2f}")
 
     # 5. Find "Best"
     # Criteria: Maximize Sharpe, subject to Max DD > -30%? 
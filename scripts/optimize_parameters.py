@@ -1,19 +1,73 @@
-import sys
-from pathlib import Path
+import csv
+import os
+import tempfile
 import pandas as pd
 import numpy as np
 import itertools
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
 
-# Add project root to path
-project_root = Path(__file__).resolve().parent.parent
-sys.path.append(str(project_root))
+# Run as a script, scripts/ is sys.path[0]; imported as scripts.<name>, the
+# project root already is
+try:
+    from _bootstrap import PROJECT_ROOT as project_root
+except ModuleNotFoundError:
+    from scripts._bootstrap import PROJECT_ROOT as project_root
 
 from src.data.loader import load_ohlcv_csv
-from src.features.builder import build_features
-from src.regimes.inference import rolling_inference
+from src.features.trend import compute_adx
 from src.strategies.robust import RobustTrendStrategy
 from src.strategies.backtester import VectorizedBacktester
+from scripts._cache import get_or_build
+
+# Per-worker copy of the backtest frame and its ADX, built once by _init_worker
+_FRAME: pd.DataFrame | None = None
+_ADX: np.ndarray | None = None
+
+def _init_worker(frame_path: str):
+    """
+    Load the shared OHLCV + regime frame once per worker process.
+    ADX depends on neither the spans nor the threshold, so it is computed here
+    once instead of in every combination.
+    """
+    global _FRAME, _ADX
+    _FRAME = pd.read_parquet(frame_path, engine="pyarrow")
+    _ADX = compute_adx(_FRAME).to_numpy()
+
+def _one(params: dict) -> dict:
+    """
+    Worker entry point: backtest one combination on the shared frame.
+    """
+    return _eval(params, _FRAME, _FRAME['regime'], _ADX)
+
+def _eval(params: dict, df: pd.DataFrame, regime_col: pd.Series, adx: np.ndarray | None = None) -> dict:
+    """
+    Backtest a single parameter combination.
+    """
+    # Initialize Strategy
+    # Note: We are testing Long-Only for now to find the best trend engine
+    strategy = RobustTrendStrategy(
+        fast_span=params['fast_span'],
+        slow_span=params['slow_span'],
+        adx_threshold=params['adx_threshold'],
+        trend_regime=2,
+        long_only=True
+    )
+    
+    # Run Backtest
+    backtester = VectorizedBacktester(initial_capital=10000.0, fee_rate=0.0005)
+    signals = strategy.generate_signals(df, regime_col, adx=adx)
+    res = backtester.run(df, signals)
+    metrics = res['metrics']
+    
+    return {
+        **params,
+        'total_return': metrics['total_return'],
+        'sharpe': metrics['sharpe_ratio'],
+        'drawdown': metrics['max_drawdown'],
+        # Approx trade count (signals are ternary, so float32 is lossless)
+        'trades': int(np.count_nonzero(np.diff(signals.to_numpy(dtype=np.float32, na_value=0.0)))) // 2
+    }
 
 def optimize():
     # 1. Load Data
@@ -21,16 +75,10 @@ def optimize():
     print("Loading data...")
     df = load_ohlcv_csv(data_path)
     
-    print("Building features...")
-    features = build_features(df)
-    features.dropna(inplace=True)
-    df = df.loc[features.index]
-    
-    # 2. Run Inference (Fixed Context)
+    # 2. Build Features & Run Inference (Fixed Context, cached)
     # We use the settings that gave us good regimes
-    print("Running inference...")
-    regimes = rolling_inference(
-        features,
+    print("Building features and running inference...")
+    inference_kwargs = dict(
         n_components=3,
         window=512,
         covariance_type="full",
@@ -39,6 +87,7 @@ def optimize():
         sort_by="rolling_std_medium",
         verbose=False
     )
+    features, regimes = get_or_build(df, data_path, inference_kwargs)
     
     df = df.loc[regimes.index]
     regime_col = regimes['regime']
@@ -54,41 +103,37 @@ def optimize():
     keys, values = zip(*param_grid.items())
     combinations = [dict(zip(keys, v)) for v in itertools.product(*values)]
     
+    # Skip invalid combinations (fast >= slow) up front so no work is dispatched for them
+    combinations = [c for c in combinations if c['fast_span'] < c['slow_span']]
+    
     print(f"Testing {len(combinations)} combinations...")
     
-    results = []
-    backtester = VectorizedBacktester(initial_capital=10000.0, fee_rate=0.0005)
+    # Results are streamed to CSV as they complete, so memory stays flat
+    # and progress survives a crash mid-run
+    output_path = project_root / "data/processed/optimization_results.csv"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fieldnames = [*keys, 'total_return', 'sharpe', 'drawdown', 'trades']
+    
+    # Workers read the frame from a temporary Parquet file once at startup,
+    # instead of receiving a pickled copy of the 10k-row frame with every task
+    n_workers = min(6, os.cpu_count() or 1)
     
-    for params in tqdm(combinations):
-        # Skip invalid combinations (fast >= slow)
-        if params['fast_span'] >= params['slow_span']:
-            continue
-            
-        # Initialize Strategy
-        # Note: We are testing Long-Only for now to find the best trend engine
-        strategy = RobustTrendStrategy(
-            fast_span=params['fast_span'],
-            slow_span=params['slow_span'],
-            adx_threshold=params['adx_threshold'],
-            trend_regime=2,
-            long_only=True
-        )
+    with tempfile.TemporaryDirectory() as tmp_dir, open(output_path, 'w', newline='') as f:
+        frame_path = os.path.join(tmp_dir, "frame.parquet")
+        df.assign(regime=regime_col).to_parquet(frame_path, engine="pyarrow")
         
-        # Run Backtest
-        signals = strategy.generate_signals(df, regime_col)
-        res = backtester.run(df, signals)
-        metrics = res['metrics']
+        out = csv.DictWriter(f, fieldnames=fieldnames)
+        out.writeheader()
         
-        results.append({
-            **params,
-            'total_return': metrics['total_return'],
-            'sharpe': metrics['sharpe_ratio'],
-            'drawdown': metrics['max_drawdown'],
-            'trades': (signals.diff().abs() > 0).sum() / 2 # Approx trade count
-        })
+        # Each combination is independent pure-CPU work, so fan out across processes
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(frame_path,)) as executor:
+            results = executor.map(_one, combinations, chunksize=10)
+            for row in tqdm(results, total=len(combinations)):
+                out.writerow(row)
+                f.flush()
         
     # 4. Analyze Results
-    results_df = pd.DataFrame(results)
+    results_df = pd.read_csv(output_path)
     
     # Sort by Sharpe Ratio
     top_sharpe = results_df.sort_values('sharpe', ascending=False).head(5)
@@ -102,8 +147,6 @@ def optimize():
     print("\n=== TOP 5 BY TOTAL RETURN ===")
     print(top_return.to_string(index=False))
     
-    # Save all results
-    results_df.to_csv(project_root / "data/processed/optimization_results.csv", index=False)
     print("\nFull results saved to data/processed/optimization_results.csv")
 
 if __name__ == "__main__":
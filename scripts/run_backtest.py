@@ -1,15 +1,14 @@
-import sys
-from pathlib import Path
 import pandas as pd
 import numpy as np
 
-# Add project root to path
-project_root = Path(__file__).resolve().parent.parent
-sys.path.append(str(project_root))
+# Run as a script, scripts/ is sys.path[0]; imported as scripts.<name>, the
+# project root already is
+try:
+    from _bootstrap import PROJECT_ROOT as project_root
+except ModuleNotFoundError:
+    from scripts._bootstrap import PROJECT_ROOT as project_root
 
 from src.data.loader import load_ohlcv_csv
-from src.features.builder import build_features
-from src.regimes.inference import rolling_inference
 from src.backtest.engine import BacktestEngine
 from src.strategies.trend import RegimeTrendStrategy
 from src.strategies.mean_reversion import MeanReversionStrategy
@@ -19,6 +18,7 @@ from src.strategies.robust import RobustTrendStrategy
 from src.risk.sizing import apply_vol_targeting
 from src.risk.limits import RiskLimits
 from src.risk.drawdown import DrawdownControl
+from scripts._cache import get_or_build
 
 def run_backtest():
     # 1. Load Data
@@ -30,16 +30,9 @@ def run_backtest():
         print("Data not found, generating synthetic...")
         return
 
-    # 2. Build Features
-    print("Building features...")
-    features = build_features(df)
-    features.dropna(inplace=True)
-    df = df.loc[features.index]
-    
-    # 3. Run Inference
-    print("Running rolling inference (refit_interval=10, sort_by='rolling_std_medium')...")
-    regimes = rolling_inference(
-        features,
+    # 2. Build Features & 3. Run Inference (cached)
+    print("Building features and running rolling inference (refit_interval=10, sort_by='rolling_std_medium')...")
+    inference_kwargs = dict(
         n_components=3,
         window=512,
         covariance_type="full",
@@ -49,6 +42,7 @@ def run_backtest():
         sort_by="rolling_std_medium",
         verbose=True
     )
+    features, regimes = get_or_build(df, data_path, inference_kwargs)
     
     # Align data
     df = df.loc[regimes.index]
@@ -1,14 +1,5 @@
-import sys
-from pathlib import Path
-import pandas as pd
-import numpy as np
-import random
 import datetime
 
-# Add project root to path
-project_root = Path(__file__).resolve().parent.parent
-sys.path.append(str(project_root))
-
 def simulate_live_run():
     """
     Simulates what the script would do in a "Live" environment.
@@ -0,0 +1,79 @@
+"""
+Numba kernels for the backtest engine.
+
+Responsibilities:
+- Single-strategy backtest pass over raw price/signal arrays
+- Parallel backtest of a (N, K) signal grid
+
+Always imported as `src.backtest._kernels` (see src/utils/jit.py).
+"""
+
+import numpy as np
+
+from src.utils.jit import njit, prange
+
+@njit(cache=True)
+def run_core(price, signal, fee_rate, yield_per_bar, initial_capital):
+    """
+    Single-pass backtest over raw arrays (Numba kernel).
+    `signal` is the already-shifted position held over each bar.
+    Returns (returns, strategy_returns, idle_capital, yield_returns,
+    position_change, fees, net_returns, equity).
+    """
+    n = len(price)
+    returns = np.zeros(n)
+    strategy_returns = np.empty(n)
+    idle_capital = np.empty(n)
+    yield_returns = np.empty(n)
+    position_change = np.zeros(n)
+    fees = np.empty(n)
+    net_returns = np.empty(n)
+    equity = np.empty(n)
+    
+    growth = 1.0
+    for i in range(n):
+        s = signal[i]
+        if i > 0:
+            r = price[i] / price[i - 1] - 1.0
+            if not np.isnan(r):
+                returns[i] = r
+            position_change[i] = abs(s - signal[i - 1])
+        
+        strategy_returns[i] = returns[i] * s
+        idle_capital[i] = max(1.0 - abs(s), 0.0)
+        yield_returns[i] = idle_capital[i] * yield_per_bar
+        fees[i] = position_change[i] * fee_rate
+        net_returns[i] = strategy_returns[i] + yield_returns[i] - fees[i]
+        
+        growth *= 1.0 + net_returns[i]
+        equity[i] = initial_capital * growth
+    
+    return returns, strategy_returns, idle_capital, yield_returns, position_change, fees, net_returns, equity
+
+@njit(parallel=True, cache=True)
+def run_grid(price, signals, fee_rate, yield_per_bar, initial_capital, net_returns, equity):
+    """
+    Backtest every column of `signals` (already shifted) in parallel (Numba kernel).
+    Fills net_returns and equity, both shaped like signals. Same arithmetic as run_core.
+    """
+    n, k_count = signals.shape
+    
+    returns = np.zeros(n)
+    for i in range(1, n):
+        r = price[i] / price[i - 1] - 1.0
+        if not np.isnan(r):
+            returns[i] = r
+    
+    for k in prange(k_count):
+        growth = 1.0
+        prev = 0.0
+        for i in range(n):
+            s = signals[i, k]
+            position_change = abs(s - prev) if i > 0 else 0.0
+            prev = s
+            
+            net = returns[i] * s + max(1.0 - abs(s), 0.0) * yield_per_bar - position_change * fee_rate
+            net_returns[i, k] = net
+            
+            growth *= 1.0 + net
+            equity[i, k] = initial_capital * growth
@@ -1,6 +1,51 @@
 import pandas as pd
 import numpy as np
-from src.backtest.metrics import compute_performance_metrics
+from src.backtest.metrics import compute_performance_metrics, compute_performance_metrics_2d
+from src.backtest._kernels import run_core, run_grid
+from src.utils.jit import NUMBA_AVAILABLE
+
+def _run_core_np(price, signal, fee_rate, yield_per_bar, initial_capital):
+    """
+    Vectorized equivalent of _kernels.run_core (NumPy fallback when numba is unavailable).
+    """
+    returns = np.zeros(len(price))
+    returns[1:] = price[1:] / price[:-1] - 1.0
+    returns[np.isnan(returns)] = 0.0
+    
+    strategy_returns = returns * signal
+    idle_capital = np.maximum(1.0 - np.abs(signal), 0.0)
+    position_change = np.abs(np.diff(signal, prepend=signal[:1]))
+    net_returns = strategy_returns.copy()
+    
+    # Zero idle yield / zero fees (the defaults) skip their terms entirely
+    if yield_per_bar == 0.0:
+        yield_returns = np.zeros_like(returns)
+    else:
+        yield_returns = idle_capital * yield_per_bar
+        net_returns += yield_returns
+    if fee_rate == 0.0:
+        fees = np.zeros_like(returns)
+    else:
+        fees = position_change * fee_rate
+        net_returns -= fees
+    equity = initial_capital * np.cumprod(1.0 + net_returns)
+    
+    return returns, strategy_returns, idle_capital, yield_returns, position_change, fees, net_returns, equity
+
+def _run_grid_np(price, signals, fee_rate, yield_per_bar, initial_capital, net_returns, equity):
+    """
+    Vectorized equivalent of _kernels.run_grid (NumPy fallback when numba is unavailable).
+    """
+    returns = np.zeros(len(price))
+    returns[1:] = price[1:] / price[:-1] - 1.0
+    returns[np.isnan(returns)] = 0.0
+    
+    np.multiply(returns[:, None], signals, out=net_returns)
+    if yield_per_bar != 0.0:
+        net_returns += np.maximum(1.0 - np.abs(signals), 0.0) * yield_per_bar
+    if fee_rate != 0.0:
+        net_returns -= np.abs(np.diff(signals, axis=0, prepend=signals[:1])) * fee_rate
+    equity[:] = initial_capital * np.cumprod(1.0 + net_returns, axis=0)
 
 class BacktestEngine:
     """
@@ -8,10 +53,22 @@ class BacktestEngine:
     Orchestrates Data -> Signals -> Risk -> Execution -> Metrics.
     """
     
+    # Fixed 4h candle cadence
+    CANDLES_PER_YEAR = 6 * 365
+    
     def __init__(self, initial_capital: float = 10000.0, fee_rate: float = 0.0005, idle_apy: float = 0.0):
         self.initial_capital = initial_capital
         self.fee_rate = fee_rate
         self.idle_apy = idle_apy
+    
+    @property
+    def yield_per_bar(self) -> float:
+        """
+        Per-candle yield on idle capital; exactly 0.0 when idle_apy is 0.
+        """
+        if self.idle_apy == 0.0:
+            return 0.0
+        return (1 + self.idle_apy) ** (1 / self.CANDLES_PER_YEAR) - 1
         
     def run(self, df: pd.DataFrame, signals: pd.Series, price_col: str = "close") -> dict:
         """
@@ -23,35 +80,34 @@ class BacktestEngine:
             price_col: Column to use for execution.
         """
         # 1. Setup Data
-        data = df[[price_col]].copy()
+        price = df[price_col].to_numpy(dtype=np.float64)
+        # Returns are taken on padded prices, like pct_change over a missing close
+        padded = df[price_col].ffill().to_numpy(dtype=np.float64)
         
         # 2. Shift Signals (Avoid Lookahead)
         # The signal calculated at time t is applied at time t+1 (or close of t, effectively next bar)
-        data['signal'] = signals.shift(1).fillna(0)
-        
-        # 3. Calculate Raw Returns
-        data['returns'] = data[price_col].pct_change().fillna(0)
-        
-        # 4. Strategy Returns (Gross)
-        data['strategy_returns'] = data['returns'] * data['signal']
+        signal = signals.shift(1).reindex(df.index).fillna(0).to_numpy(dtype=np.float64)
         
-        # 5. Yield on Idle Capital
-        # If signal is 0.6, then 0.4 is idle.
-        candles_per_year = 6 * 365
-        yield_per_bar = (1 + self.idle_apy) ** (1 / candles_per_year) - 1
-        data['idle_capital'] = (1 - data['signal'].abs()).clip(lower=0)
-        data['yield_returns'] = data['idle_capital'] * yield_per_bar
+        # 3-8. Returns, idle yield, fees, net returns and equity in one pass
+        # If signal is 0.6, then 0.4 is idle and earns the idle yield.
+        core = run_core if NUMBA_AVAILABLE else _run_core_np
+        (returns, strategy_returns, idle_capital, yield_returns,
+         position_change, fees, net_returns, equity) = core(
+            padded, signal, self.fee_rate, self.yield_per_bar, self.initial_capital
+        )
         
-        # 6. Transaction Costs
-        # Turnover = change in position size
-        data['position_change'] = data['signal'].diff().abs().fillna(0)
-        data['fees'] = data['position_change'] * self.fee_rate
-        
-        # 7. Net Returns
-        data['net_returns'] = data['strategy_returns'] + data['yield_returns'] - data['fees']
-        
-        # 8. Equity Curve
-        data['equity'] = self.initial_capital * (1 + data['net_returns']).cumprod()
+        data = pd.DataFrame({
+            price_col: price,
+            'signal': signal,
+            'returns': returns,
+            'strategy_returns': strategy_returns,
+            'idle_capital': idle_capital,
+            'yield_returns': yield_returns,
+            'position_change': position_change,
+            'fees': fees,
+            'net_returns': net_returns,
+            'equity': equity
+        }, index=df.index)
         
         # 9. Compute Metrics
         metrics = compute_performance_metrics(data['net_returns'], data['equity'], self.initial_capital)
@@ -64,3 +120,46 @@ class BacktestEngine:
             'data': data,
             'metrics': metrics
         }
+    
+    def run_grid(self, df: pd.DataFrame, signals: pd.DataFrame | np.ndarray, price_col: str = "close") -> dict:
+        """
+        Execute one backtest per signal column in a single call.
+        
+        Args:
+            df: Price DataFrame.
+            signals: Position sizing signals, shape (N, K): one column per strategy,
+                rows aligned with df. A DataFrame's columns label the results.
+            price_col: Column to use for execution.
+            
+        Returns:
+            dict: 'net_returns' and 'equity' DataFrames (N, K), and a 'metrics'
+            DataFrame with one row per strategy.
+        """
+        if isinstance(signals, pd.DataFrame):
+            columns = signals.columns
+            signals = signals.reindex(df.index).to_numpy(dtype=np.float64)
+        else:
+            signals = np.asarray(signals, dtype=np.float64)
+            columns = pd.RangeIndex(signals.shape[1])
+        
+        # Padded over missing closes, same as run()
+        price = df[price_col].ffill().to_numpy(dtype=np.float64)
+        
+        # Shift Signals (Avoid Lookahead), same as run()
+        shifted = np.zeros_like(signals)
+        shifted[1:] = signals[:-1]
+        shifted[np.isnan(shifted)] = 0.0
+        
+        net_returns = np.empty_like(shifted)
+        equity = np.empty_like(shifted)
+        grid = run_grid if NUMBA_AVAILABLE else _run_grid_np
+        grid(price, shifted, self.fee_rate, self.yield_per_bar, self.initial_capital, net_returns, equity)
+        
+        metrics = compute_performance_metrics_2d(net_returns, equity, self.initial_capital)
+        metrics['time_in_market'] = (np.abs(shifted) > 0).mean(axis=0)
+        
+        return {
+            'net_returns': pd.DataFrame(net_returns, index=df.index, columns=columns),
+            'equity': pd.DataFrame(equity, index=df.index, columns=columns),
+            'metrics': pd.DataFrame(metrics, index=columns)
+        }
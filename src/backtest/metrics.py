@@ -1,5 +1,50 @@
 import pandas as pd
 import numpy as np
+from src.utils.jit import njit, NUMBA_AVAILABLE
+
+@njit(cache=True)
+def _return_moments(returns):
+    """
+    Mean, sample std (ddof=1) and mean squared downside (min(r, 0)^2) of returns,
+    skipping NaNs, in two passes (Numba kernel).
+    """
+    total = 0.0
+    downside_sq = 0.0
+    count = 0
+    for r in returns:
+        if not np.isnan(r):
+            total += r
+            if r < 0:
+                downside_sq += r * r
+            count += 1
+    if count == 0:
+        return np.nan, np.nan, np.nan
+    mean = total / count
+    
+    sq = 0.0
+    for r in returns:
+        if not np.isnan(r):
+            sq += (r - mean) * (r - mean)
+    std = np.sqrt(sq / (count - 1)) if count > 1 else np.nan
+    
+    return mean, std, downside_sq / count
+
+@njit(cache=True)
+def _max_drawdown(equity):
+    """
+    Most negative (equity - running max) / running max, in one pass (Numba kernel).
+    """
+    running_max = np.nan
+    max_dd = np.nan
+    for x in equity:
+        if np.isnan(x):
+            continue
+        if np.isnan(running_max) or x > running_max:
+            running_max = x
+        dd = (x - running_max) / running_max
+        if np.isnan(max_dd) or dd < max_dd:
+            max_dd = dd
+    return max_dd
 
 def compute_performance_metrics(returns: pd.Series, equity: pd.Series, initial_capital: float = 10000.0, candles_per_year: int = 2190) -> dict:
     """
@@ -22,9 +67,25 @@ def compute_performance_metrics(returns: pd.Series, equity: pd.Series, initial_c
     # CAGR
     cagr = (equity.iloc[-1] / initial_capital) ** (1 / n_years) - 1 if n_years > 0 else 0
     
+    if NUMBA_AVAILABLE:
+        # Moments and drawdown from fused passes over the raw arrays
+        mean_bar, std_bar, downside_variance = _return_moments(returns.to_numpy(dtype=np.float64))
+        max_drawdown = _max_drawdown(equity.to_numpy(dtype=np.float64))
+    else:
+        mean_bar = returns.mean()
+        std_bar = returns.std()
+        
+        downside_returns = returns.copy()
+        downside_returns[downside_returns > 0] = 0
+        downside_variance = (downside_returns ** 2).mean()
+        
+        rolling_max = equity.cummax()
+        drawdown = (equity - rolling_max) / rolling_max
+        max_drawdown = drawdown.min()
+    
     # Volatility (Annualized)
-    mean_ret = returns.mean() * candles_per_year
-    vol = returns.std() * np.sqrt(candles_per_year)
+    mean_ret = mean_bar * candles_per_year
+    vol = std_bar * np.sqrt(candles_per_year)
     
     # Sharpe Ratio
     sharpe = mean_ret / vol if vol > 0 else 0
@@ -32,20 +93,65 @@ def compute_performance_metrics(returns: pd.Series, equity: pd.Series, initial_c
     # Sortino Ratio (Downside Deviation from 0)
     # We use 0 as the target return (MAR = 0)
     # Downside deviation is the square root of the mean of squared negative returns
-    downside_returns = returns.copy()
-    downside_returns[downside_returns > 0] = 0
-    downside_variance = (downside_returns ** 2).mean()
     downside_dev = np.sqrt(downside_variance) * np.sqrt(candles_per_year)
     
     sortino = mean_ret / downside_dev if downside_dev > 0 else 0
     
+    # Calmar Ratio (CAGR / Max Drawdown)
+    calmar = cagr / abs(max_drawdown) if max_drawdown != 0 else 0
+    
+    return {
+        'total_return': total_return,
+        'cagr': cagr,
+        'volatility': vol,
+        'sharpe_ratio': sharpe,
+        'sortino_ratio': sortino,
+        'max_drawdown': max_drawdown,
+        'calmar_ratio': calmar
+    }
+
+def compute_performance_metrics_2d(returns: np.ndarray, equity: np.ndarray, initial_capital: float = 10000.0, candles_per_year: int = 2190) -> dict:
+    """
+    Column-wise compute_performance_metrics for a grid of K backtests.
+    
+    Args:
+        returns: Array (N, K) of net returns per bar.
+        equity: Array (N, K) of equity curve values.
+        initial_capital: Starting capital.
+        candles_per_year: Number of bars in a year (6 * 365 = 2190 for 4h).
+        
+    Returns:
+        dict: Same keys as compute_performance_metrics, each an array of length K.
+    """
+    final = equity[-1] / initial_capital
+    total_return = final - 1
+    
+    # Time factor
+    n_years = len(returns) / candles_per_year
+    
+    # CAGR
+    cagr = final ** (1 / n_years) - 1 if n_years > 0 else np.zeros(returns.shape[1])
+    
+    # Volatility (Annualized)
+    mean_ret = returns.mean(axis=0) * candles_per_year
+    vol = returns.std(axis=0, ddof=1) * np.sqrt(candles_per_year)
+    
+    # Sharpe Ratio
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(vol > 0, mean_ret / vol, 0.0)
+    
+    # Sortino Ratio (Downside Deviation from 0)
+    downside_dev = np.sqrt((np.minimum(returns, 0.0) ** 2).mean(axis=0)) * np.sqrt(candles_per_year)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sortino = np.where(downside_dev > 0, mean_ret / downside_dev, 0.0)
+    
     # Max Drawdown
-    rolling_max = equity.cummax()
-    drawdown = (equity - rolling_max) / rolling_max
-    max_drawdown = drawdown.min()
+    rolling_max = np.maximum.accumulate(equity, axis=0)
+    max_drawdown = ((equity - rolling_max) / rolling_max).min(axis=0)
     
     # Calmar Ratio (CAGR / Max Drawdown)
-    calmar = cagr / abs(max_drawdown) if max_drawdown != 0 else 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        calmar = np.where(max_drawdown != 0, cagr / np.abs(max_drawdown), 0.0)
     
     return {
         'total_return': total_return,
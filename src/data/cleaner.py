@@ -8,6 +8,7 @@ Responsibilities:
 - Detect missing or malformed candles
 """
 
+import numpy as np
 import pandas as pd
 
 
@@ -22,13 +23,16 @@ def validate_ohlcv(df: pd.DataFrame) -> None:
         if col not in df.columns:
             raise ValueError(f"Missing column: {col}")
 
-    if (df["high"] < df[["open", "close", "low"]].max(axis=1)).any():
+    # Compare on raw arrays; fmax/fmin skip NaNs like DataFrame.max/min(axis=1)
+    o, h, l, c, v = (df[k].to_numpy() for k in ("open", "high", "low", "close", "volume"))
+
+    if (h < np.fmax(np.fmax(o, c), l)).any():
         raise ValueError("High price lower than open/close/low.")
 
-    if (df["low"] > df[["open", "close", "high"]].min(axis=1)).any():
+    if (l > np.fmin(np.fmin(o, c), h)).any():
         raise ValueError("Low price higher than open/close/high.")
 
-    if (df["volume"] < 0).any():
+    if (v < 0).any():
         raise ValueError("Negative volume detected.")
 
 
@@ -36,15 +40,17 @@ def validate_time_index(df: pd.DataFrame) -> None:
     if not isinstance(df.index, pd.DatetimeIndex):
         raise TypeError("Index must be a DatetimeIndex.")
 
-    if not df.index.is_monotonic_increasing:
+    # One diff over the raw datetime64 values covers ordering, duplicates and
+    # cadence without building a Series of Timedeltas
+    deltas = np.diff(df.index.values)
+
+    if (deltas < np.timedelta64(0)).any():
         raise ValueError("Timestamps are not sorted.")
 
-    if df.index.has_duplicates:
+    if (deltas == np.timedelta64(0)).any():
         raise ValueError("Duplicate timestamps detected.")
 
-    deltas = df.index.to_series().diff().dropna()
-
-    if not (deltas == EXPECTED_DELTA).all():
+    if not (deltas == EXPECTED_DELTA.to_timedelta64()).all():
         raise ValueError(
             "Detected missing or irregular 4h candles in data."
         )
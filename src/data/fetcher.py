@@ -3,23 +3,29 @@ OHLCV data fetcher for BTC using ccxt (Binance).
 
 Responsibilities:
 - Fetch historical 4h BTC/USDT OHLCV data
-- Cache data locally as CSV
+- Cache data locally as CSV (plus a Parquet copy for fast reloads)
 - Incrementally update existing data
 """
 
 from pathlib import Path
 from typing import Optional
-import time
+import asyncio
 
 import ccxt
+import ccxt.async_support as ccxt_async
 import pandas as pd
 
+from src.data.loader import read_ohlcv_table
+
 
 DATA_PATH = Path("data/raw/btc_4h.csv")
 SYMBOL = "BTC/USDT"
 TIMEFRAME = "4h"
 EXCHANGE_ID = "binance"
 
+# Concurrent page requests during a backfill (ccxt's throttler still spaces them)
+MAX_CONCURRENT_REQUESTS = 5
+
 
 def _init_exchange() -> ccxt.Exchange:
     exchange = getattr(ccxt, EXCHANGE_ID)({
@@ -29,6 +35,30 @@ def _init_exchange() -> ccxt.Exchange:
     return exchange
 
 
+async def _fetch_pages(exchange_id: str, starts_ms: list, limit: int) -> list:
+    """
+    Fetch one page of candles per start timestamp concurrently.
+    """
+    exchange = getattr(ccxt_async, exchange_id)({
+        "enableRateLimit": True,
+    })
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def fetch_page(since_ms: int) -> list:
+        async with semaphore:
+            return await exchange.fetch_ohlcv(
+                SYMBOL,
+                timeframe=TIMEFRAME,
+                since=since_ms,
+                limit=limit,
+            )
+
+    try:
+        return await asyncio.gather(*(fetch_page(s) for s in starts_ms))
+    finally:
+        await exchange.close()
+
+
 def fetch_ohlcv_since(
     exchange: ccxt.Exchange,
     since: Optional[pd.Timestamp] = None,
@@ -37,6 +67,9 @@ def fetch_ohlcv_since(
     """
     Fetch OHLCV candles since a given timestamp.
 
+    With a start timestamp, candle boundaries are deterministic, so every
+    page start is computed up front and the pages are fetched concurrently.
+
     Returns DataFrame with columns:
     timestamp, open, high, low, close, volume
     """
@@ -46,27 +79,34 @@ def fetch_ohlcv_since(
 
     all_rows = []
 
-    while True:
-        ohlcv = exchange.fetch_ohlcv(
-            SYMBOL,
-            timeframe=TIMEFRAME,
-            since=since_ms,
-            limit=limit,
-        )
-
-        if not ohlcv:
-            break
+    if since_ms is not None:
+        page_ms = exchange.parse_timeframe(TIMEFRAME) * 1000 * limit
+        starts_ms = list(range(since_ms, exchange.milliseconds(), page_ms))
+        pages = asyncio.run(_fetch_pages(exchange.id, starts_ms, limit))
+        for ohlcv in pages:
+            all_rows.extend(ohlcv)
+    else:
+        # No start: page forwards from the exchange's default (rate limiting
+        # is handled by ccxt via enableRateLimit)
+        while True:
+            ohlcv = exchange.fetch_ohlcv(
+                SYMBOL,
+                timeframe=TIMEFRAME,
+                since=since_ms,
+                limit=limit,
+            )
 
-        all_rows.extend(ohlcv)
+            if not ohlcv:
+                break
 
-        # Advance since_ms to last candle + 1 ms
-        since_ms = ohlcv[-1][0] + 1
+            all_rows.extend(ohlcv)
 
-        # Stop if fewer than limit returned (no more data)
-        if len(ohlcv) < limit:
-            break
+            # Advance since_ms to last candle + 1 ms
+            since_ms = ohlcv[-1][0] + 1
 
-        time.sleep(exchange.rateLimit / 1000)
+            # Stop if fewer than limit returned (no more data)
+            if len(ohlcv) < limit:
+                break
 
     if not all_rows:
         return pd.DataFrame()
@@ -78,6 +118,9 @@ def fetch_ohlcv_since(
 
     df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
 
+    # Pages can overlap at their edges
+    df = df.drop_duplicates(subset="timestamp").sort_values("timestamp", ignore_index=True)
+
     return df
 
 
@@ -90,7 +133,9 @@ def update_local_ohlcv() -> pd.DataFrame:
     exchange = _init_exchange()
 
     if DATA_PATH.exists():
-        existing = pd.read_csv(DATA_PATH)
+        # Reads the typed Parquet copy when it is up to date, instead of
+        # re-parsing every timestamp and float from the CSV
+        existing = read_ohlcv_table(DATA_PATH)
         existing["timestamp"] = pd.to_datetime(
             existing["timestamp"], utc=True
         )
@@ -114,6 +159,15 @@ def update_local_ohlcv() -> pd.DataFrame:
         print(f"Fetching data starting from {start_date}...")
         combined = fetch_ohlcv_since(exchange, since=start_date)
 
+    combined["timestamp"] = combined["timestamp"].astype("datetime64[ns, UTC]")
     combined.to_csv(DATA_PATH, index=False)
 
+    # Written after the CSV so the loader sees it as up to date
+    combined.to_parquet(
+        DATA_PATH.with_suffix(".parquet"),
+        engine="pyarrow",
+        compression="zstd",
+        index=False,
+    )
+
     return combined
@@ -2,7 +2,7 @@
 Data loader for BTC OHLCV data.
 
 Responsibilities:
-- Load raw 4h BTC OHLCV data from disk
+- Load raw 4h BTC OHLCV data from disk (CSV, with a Parquet sidecar cache)
 - Standardize column names
 - Parse timestamps
 - Return raw pandas DataFrame
@@ -10,8 +10,12 @@ Responsibilities:
 No cleaning or validation happens here.
 """
 
+import os
 from pathlib import Path
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
 
 
 REQUIRED_COLUMNS = {
@@ -22,6 +26,62 @@ REQUIRED_COLUMNS = {
     "volume",
 }
 
+# Column types declared up front so pyarrow skips type inference
+PRICE_TYPE = pa.float64()
+CSV_COLUMN_TYPES = {
+    "timestamp": pa.timestamp("ns", tz="UTC"),
+    "open": PRICE_TYPE,
+    "high": PRICE_TYPE,
+    "low": PRICE_TYPE,
+    "close": PRICE_TYPE,
+    "volume": pa.float64(),
+}
+
+
+def read_ohlcv_table(filepath: str | Path) -> pd.DataFrame:
+    """
+    Read the raw table, preferring a Parquet sidecar if it is up to date.
+
+    The first CSV read writes `<name>.parquet` next to the CSV; subsequent
+    loads read that instead until the CSV is modified again. A `.parquet`
+    path is read directly. Files that do not match the typed schema are
+    read with pandas instead.
+    """
+    filepath = Path(filepath)
+    if filepath.suffix == ".parquet":
+        return pd.read_parquet(filepath, engine="pyarrow")
+
+    parquet_path = filepath.with_suffix(".parquet")
+
+    if (
+        parquet_path.exists()
+        and parquet_path.stat().st_mtime_ns >= filepath.stat().st_mtime_ns
+    ):
+        return pd.read_parquet(parquet_path, engine="pyarrow")
+
+    try:
+        with pa.memory_map(str(filepath), "r") as source:
+            table = pv.read_csv(
+                source,
+                convert_options=pv.ConvertOptions(column_types=CSV_COLUMN_TYPES),
+            )
+    except pa.ArrowInvalid:
+        # Values pyarrow cannot convert to the declared schema (e.g. an unusual
+        # timestamp format): let pandas parse the file, without a sidecar
+        return pd.read_csv(filepath)
+
+    # Write to a private temp file and rename it into place, so an interrupted
+    # or concurrent write never leaves a truncated sidecar newer than the CSV
+    tmp_path = parquet_path.with_name(f"{parquet_path.name}.{os.getpid()}.tmp")
+    try:
+        pq.write_table(table, tmp_path)
+        tmp_path.replace(parquet_path)
+    except OSError:
+        # Read-only data directory: fall back to CSV on every load
+        tmp_path.unlink(missing_ok=True)
+
+    return table.to_pandas()
+
 
 def load_ohlcv_csv(
     filepath: str | Path,
@@ -32,17 +92,20 @@ def load_ohlcv_csv(
     if not filepath.exists():
         raise FileNotFoundError(f"Data file not found: {filepath}")
 
-    df = pd.read_csv(filepath)
+    df = read_ohlcv_table(filepath)
 
     df.columns = [c.lower() for c in df.columns]
 
     if timestamp_col not in df.columns:
         raise ValueError(f"Timestamp column '{timestamp_col}' not found.")
 
-    df[timestamp_col] = pd.to_datetime(df[timestamp_col], utc=True)
+    # Timestamps are already typed by pyarrow, so this is a tz check rather than
+    # a parse; building the index directly avoids the set_index copy
+    df.index = pd.DatetimeIndex(pd.to_datetime(df.pop(timestamp_col), utc=True))
 
-    df = df.set_index(timestamp_col)
-    df = df.sort_index()
+    # Stored data is normally in order already
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
 
     missing = REQUIRED_COLUMNS - set(df.columns)
     if missing:
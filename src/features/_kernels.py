@@ -0,0 +1,270 @@
+"""
+Numba kernels shared by the feature modules.
+
+Responsibilities:
+- Compute rolling mean/std/skew/kurtosis of log returns for every window in one sweep
+- Match pandas rolling(window) semantics (NaN until full, NaN if the window has a NaN)
+- Exponentially weighted means (full series or last value only), EMA/MACD, RSI and ADX
+  with pandas ewm semantics
+
+Always imported as `src.features._kernels` (see src/utils/jit.py).
+"""
+
+import numpy as np
+
+from src.utils.jit import njit, prange
+
+# Every window used on log returns by returns.py, volatility.py and distribution.py
+RETURN_STAT_WINDOWS = (8, 24, 32, 64, 128)
+
+# Statistic axis of the rolling_return_stats output
+STAT_MEAN = 0
+STAT_STD = 1
+STAT_SKEW = 2
+STAT_KURT = 3
+
+@njit(parallel=True, cache=True, nogil=True)
+def fused_return_stats(x, windows, out):
+    """
+    Fill out[:, j, :] with rolling (mean, std, skew, kurt) of x over windows[j].
+
+    Each window is an independent O(n) sweep keeping running power sums, so
+    windows run in parallel. Std uses ddof=1; skew and kurtosis use the same
+    bias corrections and (near) zero-variance guard as pandas.
+    """
+    n = len(x)
+    out[:] = np.nan
+    
+    # Moments are shift-invariant, so centre on the global mean to limit
+    # cancellation in the running power sums
+    total = 0.0
+    count = 0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            total += x[i]
+            count += 1
+    shift = total / count if count > 0 else 0.0
+    
+    for j in prange(len(windows)):
+        window = windows[j]
+        w = float(window)
+        s1 = 0.0
+        s2 = 0.0
+        s3 = 0.0
+        s4 = 0.0
+        n_nan = 0
+        
+        for i in range(n):
+            # Add the incoming value
+            v = x[i] - shift
+            if np.isnan(v):
+                n_nan += 1
+            else:
+                s1 += v
+                s2 += v * v
+                s3 += v * v * v
+                s4 += v * v * v * v
+            
+            # Drop the value leaving the window
+            if i >= window:
+                u = x[i - window] - shift
+                if np.isnan(u):
+                    n_nan -= 1
+                else:
+                    s1 -= u
+                    s2 -= u * u
+                    s3 -= u * u * u
+                    s4 -= u * u * u * u
+            
+            if i < window - 1 or n_nan > 0:
+                continue
+            
+            # Central moments from raw power sums
+            a = s1 / w
+            b = max(s2 / w - a * a, 0.0)
+            out[i, j, STAT_MEAN] = a + shift
+            if window >= 2:
+                out[i, j, STAT_STD] = np.sqrt(b * w / (w - 1.0))
+            if b <= 1e-14:
+                continue
+            c = s3 / w - a * a * a - 3.0 * a * b
+            d = s4 / w - a * a * a * a - 6.0 * b * a * a - 4.0 * c * a
+            
+            # Fisher-Pearson bias corrections (same as pandas)
+            if window >= 3:
+                out[i, j, STAT_SKEW] = np.sqrt(w * (w - 1.0)) * c / ((w - 2.0) * b ** 1.5)
+            if window >= 4:
+                k = (w * w - 1.0) * d / (b * b) - 3.0 * (w - 1.0) ** 2
+                out[i, j, STAT_KURT] = k / ((w - 2.0) * (w - 3.0))
+
+@njit(cache=True)
+def ewm_step(weighted, old_wt, cur, alpha, adjust):
+    """
+    Advance one exponentially weighted mean by one observation, following pandas
+    ewm(alpha=..., adjust=...).mean() with ignore_na=False. Start from
+    weighted=NaN, old_wt=1.0. Returns the new (weighted, old_wt).
+    """
+    is_obs = not np.isnan(cur)
+    if not np.isnan(weighted):
+        # Missing values still decay the old weight
+        old_wt *= 1.0 - alpha
+        if is_obs:
+            new_wt = 1.0 if adjust else alpha
+            if weighted != cur:
+                weighted = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+            if adjust:
+                old_wt += new_wt
+            else:
+                old_wt = 1.0
+    elif is_obs:
+        weighted = cur
+    return weighted, old_wt
+
+@njit(cache=True, nogil=True)
+def ewm_mean(x, alpha, adjust, min_periods):
+    """
+    Exponentially weighted mean with pandas ewm(alpha=..., adjust=...).mean() semantics,
+    including NaN handling (ignore_na=False) and min_periods (Numba kernel).
+    """
+    n = len(x)
+    out = np.empty(n)
+    weighted = np.nan
+    old_wt = 1.0
+    nobs = 0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            nobs += 1
+        weighted, old_wt = ewm_step(weighted, old_wt, x[i], alpha, adjust)
+        out[i] = weighted if nobs >= min_periods else np.nan
+    return out
+
+@njit(cache=True)
+def ewm_last(x, alpha, adjust):
+    """
+    Last value of ewm_mean(x, alpha, adjust, 0), without materializing the
+    series (Numba kernel).
+    """
+    weighted = np.nan
+    old_wt = 1.0
+    for i in range(len(x)):
+        weighted, old_wt = ewm_step(weighted, old_wt, x[i], alpha, adjust)
+    return weighted
+
+@njit(cache=True)
+def multi_ema_macd(close, alphas, fast_alpha, slow_alpha, signal_alpha, out):
+    """
+    Stream close once, updating every EMA state per tick (Numba kernel).
+
+    Fills out[:, k] with EMA(alphas[k]) for each k, followed by the MACD line,
+    signal and histogram. The MACD signal EMA is fed the current MACD line
+    value in the same step, so no second pass is needed. All EMAs use
+    adjust=False, like compute_ema.
+    """
+    k_count = len(alphas)
+    ema = np.full(k_count, np.nan)
+    ema_wt = np.ones(k_count)
+    fast, fast_wt = np.nan, 1.0
+    slow, slow_wt = np.nan, 1.0
+    signal, signal_wt = np.nan, 1.0
+    
+    for i in range(len(close)):
+        cur = close[i]
+        for k in range(k_count):
+            ema[k], ema_wt[k] = ewm_step(ema[k], ema_wt[k], cur, alphas[k], False)
+            out[i, k] = ema[k]
+        
+        fast, fast_wt = ewm_step(fast, fast_wt, cur, fast_alpha, False)
+        slow, slow_wt = ewm_step(slow, slow_wt, cur, slow_alpha, False)
+        macd_line = fast - slow
+        signal, signal_wt = ewm_step(signal, signal_wt, macd_line, signal_alpha, False)
+        
+        out[i, k_count] = macd_line
+        out[i, k_count + 1] = signal
+        out[i, k_count + 2] = macd_line - signal
+
+@njit(cache=True, error_model='numpy')
+def wilder_rsi(close, window):
+    """
+    RSI over a raw close array (Numba kernel). Same smoothing as compute_rsi.
+    """
+    n = len(close)
+    gain = np.zeros(n)
+    loss = np.zeros(n)
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            gain[i] = delta
+        elif delta < 0:
+            loss[i] = -delta
+    
+    alpha = 1.0 / window
+    avg_gain = ewm_mean(gain, alpha, True, window)
+    avg_loss = ewm_mean(loss, alpha, True, window)
+    
+    rsi = np.empty(n)
+    for i in range(n):
+        rs = avg_gain[i] / avg_loss[i]
+        rsi[i] = 100.0 - (100.0 / (1.0 + rs))
+    return rsi
+
+@njit(cache=True, nogil=True, error_model='numpy')
+def wilder_adx(high, low, close, window):
+    """
+    ADX over raw high/low/close arrays (Numba kernel). Same smoothing as compute_adx,
+    with the true range and directional movement computed inline.
+    """
+    n = len(close)
+    tr = np.empty(n)
+    plus_dm = np.zeros(n)
+    minus_dm = np.zeros(n)
+    if n == 0:
+        return tr
+    
+    tr[0] = high[0] - low[0]
+    for i in range(1, n):
+        # 1. True Range
+        tr[i] = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        
+        # 2. Directional Movement
+        up_move = high[i] - high[i - 1]
+        down_move = low[i - 1] - low[i]
+        if up_move > down_move and up_move > 0:
+            plus_dm[i] = up_move
+        if down_move > up_move and down_move > 0:
+            minus_dm[i] = down_move
+    
+    # 3. Wilder's Smoothing
+    alpha = 1.0 / window
+    tr_smooth = ewm_mean(tr, alpha, False, 0)
+    plus_smooth = ewm_mean(plus_dm, alpha, False, 0)
+    minus_smooth = ewm_mean(minus_dm, alpha, False, 0)
+    
+    # 4. DX and ADX
+    dx = np.empty(n)
+    for i in range(n):
+        plus_di = 100.0 * (plus_smooth[i] / tr_smooth[i])
+        minus_di = 100.0 * (minus_smooth[i] / tr_smooth[i])
+        dx[i] = 100.0 * (abs(plus_di - minus_di) / (plus_di + minus_di))
+    
+    return ewm_mean(dx, alpha, False, 0)
+
+def rolling_return_stats(log_returns) -> np.ndarray:
+    """
+    Rolling statistics of log returns for every window in RETURN_STAT_WINDOWS.
+
+    Args:
+        log_returns: Log return series or array
+
+    Returns:
+        np.ndarray: Shape (n, len(RETURN_STAT_WINDOWS), 4), indexed by STAT_*
+    """
+    x = np.asarray(log_returns, dtype=np.float64)
+    out = np.empty((len(x), len(RETURN_STAT_WINDOWS), 4), dtype=np.float64)
+    fused_return_stats(x, np.array(RETURN_STAT_WINDOWS, dtype=np.int64), out)
+    return out
+
+def window_index(window: int) -> int:
+    """
+    Position of `window` on the window axis of rolling_return_stats.
+    """
+    return RETURN_STAT_WINDOWS.index(window)
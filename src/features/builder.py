@@ -1,35 +1,103 @@
 """
 Feature Builder
 Concatenates all feature sets into a final feature matrix.
+Optionally caches the matrix as Parquet, keyed by a hash of the input data.
 """
 
+import functools
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
+from src.utils.jit import NUMBA_AVAILABLE
+from src.features._kernels import rolling_return_stats
 from src.features.returns import build_return_features
 from src.features.volatility import build_volatility_features
 from src.features.trend import build_trend_features
 from src.features.distribution import build_distribution_features
 
-def build_features(df: pd.DataFrame) -> pd.DataFrame:
+# Bump whenever a feature definition changes, to invalidate cached matrices
+FEATURE_VERSION = "2"
+
+# Input columns the features depend on
+_KEY_COLUMNS = ["open", "high", "low", "close"]
+
+@functools.lru_cache(maxsize=None)
+def _feature_source_digest() -> bytes:
+    """
+    Hash of every module in this package, so editing a feature definition
+    invalidates cached matrices even without a FEATURE_VERSION bump.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    for path in sorted(Path(__file__).resolve().parent.glob("*.py")):
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.digest()
+
+def _feature_cache_key(df: pd.DataFrame) -> str:
+    """
+    Hash of the index, the OHLC values, FEATURE_VERSION and the feature source.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    h.update(FEATURE_VERSION.encode())
+    h.update(_feature_source_digest())
+    h.update(np.ascontiguousarray(df.index.asi8).tobytes())
+    for col in _KEY_COLUMNS:
+        h.update(df[col].to_numpy(dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+def build_features(df: pd.DataFrame, cache_dir: str | Path | None = None) -> pd.DataFrame:
     """
     Build and concatenate all features for the given dataframe.
     
     Args:
         df: Input dataframe with OHLCV data
+        cache_dir: If given, the matrix is read from / written to
+            `<cache_dir>/features_<hash>.parquet`. Any change to the data, to
+            FEATURE_VERSION or to a module in src/features yields a new hash.
         
     Returns:
-        pd.DataFrame: DataFrame containing all features
+        pd.DataFrame: DataFrame containing all features (float32)
     """
+    if cache_dir is not None:
+        cache_path = Path(cache_dir) / f"features_{_feature_cache_key(df)}.parquet"
+        if cache_path.exists():
+            return pd.read_parquet(cache_path, engine="pyarrow")
+        all_features = build_features(df)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # The cache is shared by every entry point (backtest, live, diagnose), so
+        # write to a private temp file and rename it into place; a concurrent
+        # reader never sees a partially written matrix
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        all_features.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+        tmp_path.replace(cache_path)
+        return all_features
+    
+    # Log returns are shared by the return, volatility and distribution features,
+    # so compute them once here
+    log_close = np.log(df['close'].to_numpy(dtype=np.float64))
+    log_ret = np.empty_like(log_close)
+    log_ret[:1] = np.nan
+    np.subtract(log_close[1:], log_close[:-1], out=log_ret[1:])
+    log_ret = pd.Series(log_ret, index=df.index, name='close')
+    
+    # The return, volatility and distribution features all read the fused rolling
+    # statistics of log_ret; one sweep covers every window they use
+    stats = rolling_return_stats(log_ret) if NUMBA_AVAILABLE else None
+    
     # 1. Return-based features
-    return_features = build_return_features(df)
+    return_features = build_return_features(df, log_ret, stats)
     
     # 2. Volatility-based features
-    volatility_features = build_volatility_features(df)
+    volatility_features = build_volatility_features(df, log_ret, stats)
     
     # 3. Trend-based features
     trend_features = build_trend_features(df)
     
     # 4. Distribution-based features
-    distribution_features = build_distribution_features(df)
+    distribution_features = build_distribution_features(df, log_ret, stats)
     
     # Concatenate all features
     # Axis=1 to concat columns (features)
@@ -38,4 +106,6 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     
     all_features = pd.concat([return_features, volatility_features, trend_features, distribution_features], axis=1)
     
-    return all_features
+    # Everything above runs in float64; the finished matrix only feeds noisy
+    # statistical models, so store it as float32 to halve memory traffic
+    return all_features.astype(np.float32)
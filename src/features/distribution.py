@@ -9,6 +9,9 @@ Features included:
 import numpy as np
 import pandas as pd
 
+from src.utils.jit import NUMBA_AVAILABLE
+from src.features._kernels import rolling_return_stats, window_index, STAT_SKEW, STAT_KURT
+
 # Default rolling windows (consistent with other modules)
 # Note: Skew and Kurtosis require more data points to be stable
 SHORT_WINDOW = 24    # ~4 days (increased from 8)
@@ -19,7 +22,8 @@ def compute_log_returns(df: pd.DataFrame, price_col: str = "close") -> pd.Series
     """
     Compute log returns from close prices
     """
-    return np.log(df[price_col] / df[price_col].shift(1))
+    # One log pass and a difference, no intermediate price ratio
+    return np.log(df[price_col]).diff()
 
 def compute_rolling_skew(log_returns: pd.Series, window: int) -> pd.Series:
     """
@@ -38,13 +42,30 @@ def compute_rolling_kurtosis(log_returns: pd.Series, window: int) -> pd.Series:
     """
     return log_returns.rolling(window=window).kurt()
 
-def build_distribution_features(df: pd.DataFrame) -> pd.DataFrame:
+def build_distribution_features(df: pd.DataFrame, log_ret: pd.Series | None = None, stats: np.ndarray | None = None) -> pd.DataFrame:
     """
     Build all distribution-based features for a dataframe
+
+    Args:
+        df: Input dataframe with OHLCV data
+        log_ret: Precomputed log returns of df (computed here if None)
+        stats: Precomputed rolling_return_stats(log_ret) (computed here if None;
+            only used when numba is available)
     """
-    features = pd.DataFrame(index=df.index)
+    # Columns are collected as arrays and wrapped in a DataFrame once at the end
+    features = {}
+    
+    if log_ret is None:
+        log_ret = compute_log_returns(df)
     
-    log_ret = compute_log_returns(df)
+    if NUMBA_AVAILABLE:
+        # Skew and kurtosis for every window come out of one fused sweep
+        if stats is None:
+            stats = rolling_return_stats(log_ret)
+        windows = [window_index(w) for w in (SHORT_WINDOW, MEDIUM_WINDOW, LONG_WINDOW)]
+        features.update(zip(['dist_skew_short', 'dist_skew_medium', 'dist_skew_long'], stats[:, windows, STAT_SKEW].T))
+        features.update(zip(['dist_kurt_short', 'dist_kurt_medium', 'dist_kurt_long'], stats[:, windows, STAT_KURT].T))
+        return pd.DataFrame(features, index=df.index)
     
     # 1. Rolling Skewness
     features['dist_skew_short'] = compute_rolling_skew(log_ret, SHORT_WINDOW)
@@ -56,4 +77,4 @@ def build_distribution_features(df: pd.DataFrame) -> pd.DataFrame:
     features['dist_kurt_medium'] = compute_rolling_kurtosis(log_ret, MEDIUM_WINDOW)
     features['dist_kurt_long'] = compute_rolling_kurtosis(log_ret, LONG_WINDOW)
     
-    return features
+    return pd.DataFrame(features, index=df.index)
@@ -12,6 +12,9 @@ Features included:
 import pandas as pd
 import numpy as np
 
+from src.utils.jit import NUMBA_AVAILABLE
+from src.features._kernels import rolling_return_stats, window_index, STAT_MEAN, STAT_STD
+
 # Default rolling windows (number of candles)
 SHORT_WINDOW = 8     # ~1.5 days
 MEDIUM_WINDOW = 32   # ~5 days
@@ -21,7 +24,8 @@ def compute_log_returns(df: pd.DataFrame, price_col: str = "close") -> pd.Series
     """
     Compute log returns from close prices
     """
-    return np.log(df[price_col] / df[price_col].shift(1))
+    # One log pass and a difference, no intermediate price ratio
+    return np.log(df[price_col]).diff()
 
 
 def rolling_mean_return(log_returns: pd.Series, window: int = SHORT_WINDOW) -> pd.Series:
@@ -41,19 +45,61 @@ def rolling_std_return(log_returns: pd.Series, window: int = SHORT_WINDOW) -> pd
 def autocorr_lag1(log_returns: pd.Series, window: int = SHORT_WINDOW) -> pd.Series:
     """
     Rolling autocorrelation with lag 1
+    
+    Equivalent to rolling(window).apply(lambda x: x.autocorr(lag=1)): the Pearson
+    correlation of the window-1 (x_t, x_{t-1}) pairs inside each window, computed
+    in closed form from rolling sums instead of a Python call per window.
     """
-    return log_returns.rolling(window=window).apply(lambda x: x.autocorr(lag=1), raw=False)
-
-
-def build_return_features(df: pd.DataFrame) -> pd.DataFrame:
+    # Correlation is shift-invariant; centring limits cancellation in the sums
+    x = log_returns - log_returns.mean()
+    y = x.shift(1)
+    
+    # Pairs inside a window of `window` returns
+    n = window - 1
+    sx = x.rolling(window=n).sum()
+    sy = y.rolling(window=n).sum()
+    sxy = (x * y).rolling(window=n).sum()
+    sxx = (x * x).rolling(window=n).sum()
+    syy = (y * y).rolling(window=n).sum()
+    
+    cov = sxy - sx * sy / n
+    var_x = sxx - sx * sx / n
+    var_y = syy - sy * sy / n
+    
+    # Constant windows have no defined correlation; treat variance that is only
+    # rounding noise relative to the raw sums as zero
+    tol = 1e-12
+    valid = (var_x > tol * sxx) & (var_y > tol * syy)
+    return (cov / np.sqrt(var_x.where(valid) * var_y.where(valid)))
+
+
+def build_return_features(df: pd.DataFrame, log_ret: pd.Series | None = None, stats: np.ndarray | None = None) -> pd.DataFrame:
     """
     Build all return-based features for a dataframe
+
+    Args:
+        df: Input dataframe with OHLCV data
+        log_ret: Precomputed log returns of df (computed here if None)
+        stats: Precomputed rolling_return_stats(log_ret) (computed here if None;
+            only used when numba is available)
     """
-    features = pd.DataFrame(index=df.index)
+    # Columns are collected as arrays and wrapped in a DataFrame once at the end
+    features = {}
 
-    log_ret = compute_log_returns(df)
+    if log_ret is None:
+        log_ret = compute_log_returns(df)
     features["log_return"] = log_ret
 
+    if NUMBA_AVAILABLE:
+        # Rolling mean and std for every window come out of one fused sweep
+        if stats is None:
+            stats = rolling_return_stats(log_ret)
+        windows = [window_index(w) for w in (SHORT_WINDOW, MEDIUM_WINDOW, LONG_WINDOW)]
+        features.update(zip(["rolling_mean_short", "rolling_mean_medium", "rolling_mean_long"], stats[:, windows, STAT_MEAN].T))
+        features.update(zip(["rolling_std_short", "rolling_std_medium", "rolling_std_long"], stats[:, windows, STAT_STD].T))
+        features["autocorr_lag1_short"] = autocorr_lag1(log_ret, SHORT_WINDOW)
+        return pd.DataFrame(features, index=df.index)
+
     # Rolling mean returns
     features["rolling_mean_short"] = rolling_mean_return(log_ret, SHORT_WINDOW)
     features["rolling_mean_medium"] = rolling_mean_return(log_ret, MEDIUM_WINDOW)
@@ -67,4 +113,4 @@ def build_return_features(df: pd.DataFrame) -> pd.DataFrame:
     # Autocorrelation lag1 (short window)
     features["autocorr_lag1_short"] = autocorr_lag1(log_ret, SHORT_WINDOW)
 
-    return features
+    return pd.DataFrame(features, index=df.index)
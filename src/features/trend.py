@@ -12,6 +12,9 @@ Features included:
 import numpy as np
 import pandas as pd
 
+from src.utils.jit import NUMBA_AVAILABLE
+from src.features._kernels import multi_ema_macd, wilder_rsi, wilder_adx
+
 # Default rolling windows (consistent with returns.py)
 SHORT_WINDOW = 8     # ~1.5 days
 MEDIUM_WINDOW = 32   # ~5 days
@@ -50,6 +53,10 @@ def compute_rsi(series: pd.Series, window: int = 14) -> pd.Series:
     """
     Compute Relative Strength Index (RSI)
     """
+    if NUMBA_AVAILABLE:
+        rsi = wilder_rsi(series.to_numpy(dtype=np.float64), window)
+        return pd.Series(rsi, index=series.index)
+    
     delta = series.diff()
     
     # Separate gains and losses
@@ -69,25 +76,40 @@ def compute_adx(df: pd.DataFrame, window: int = 14) -> pd.Series:
     """
     Compute Average Directional Index (ADX)
     """
+    if NUMBA_AVAILABLE:
+        adx = wilder_adx(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            window
+        )
+        return pd.Series(adx, index=df.index)
+    
     high = df['high']
     low = df['low']
     close = df['close']
     
     # 1. True Range
-    tr1 = high - low
-    tr2 = (high - close.shift(1)).abs()
-    tr3 = (low - close.shift(1)).abs()
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    # Element-wise max on arrays instead of a 3-column concat; fmax skips the
+    # NaN at the first bar like DataFrame.max(axis=1)
+    prev_close = close.shift(1)
+    tr1 = (high - low).to_numpy()
+    tr2 = (high - prev_close).abs().to_numpy()
+    tr3 = (low - prev_close).abs().to_numpy()
+    tr = pd.Series(np.fmax(np.fmax(tr1, tr2), tr3), index=df.index)
     
     # 2. Directional Movement
-    up_move = high - high.shift(1)
-    down_move = low.shift(1) - low
-    
-    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
-    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
-    
-    plus_dm = pd.Series(plus_dm, index=df.index)
-    minus_dm = pd.Series(minus_dm, index=df.index)
+    # On raw arrays: the first bar has no move, so it gets zero DM
+    high_np = high.to_numpy(dtype=np.float64)
+    low_np = low.to_numpy(dtype=np.float64)
+    up_move = np.zeros(len(high_np))
+    down_move = np.zeros(len(low_np))
+    up_move[1:] = high_np[1:] - high_np[:-1]
+    down_move[1:] = low_np[:-1] - low_np[1:]
+    
+    # np.where rather than mask multiplication so NaN moves give zero DM, as before
+    plus_dm = pd.Series(np.where((up_move > down_move) & (up_move > 0), up_move, 0.0), index=df.index)
+    minus_dm = pd.Series(np.where((down_move > up_move) & (down_move > 0), down_move, 0.0), index=df.index)
     
     # 3. Smoothed TR and DM (Wilder's Smoothing)
     # Wilder's smoothing is roughly alpha = 1/n. Pandas ewm(com=n-1) or ewm(alpha=1/n)
@@ -107,7 +129,8 @@ def build_trend_features(df: pd.DataFrame, price_col: str = "close") -> pd.DataF
     """
     Build all trend-based features for a dataframe
     """
-    features = pd.DataFrame(index=df.index)
+    # Columns are collected as arrays and wrapped in a DataFrame once at the end
+    features = {}
     prices = df[price_col]
     
     # 1. Moving Averages
@@ -116,10 +139,19 @@ def build_trend_features(df: pd.DataFrame, price_col: str = "close") -> pd.DataF
     features['trend_sma_medium'] = compute_sma(prices, MEDIUM_WINDOW)
     features['trend_sma_long'] = compute_sma(prices, LONG_WINDOW)
     
-    # EMAs
-    features['trend_ema_short'] = compute_ema(prices, SHORT_WINDOW)
-    features['trend_ema_medium'] = compute_ema(prices, MEDIUM_WINDOW)
-    features['trend_ema_long'] = compute_ema(prices, LONG_WINDOW)
+    # EMAs (and MACD, below) from one streaming pass when numba is available
+    if NUMBA_AVAILABLE:
+        spans = np.array([SHORT_WINDOW, MEDIUM_WINDOW, LONG_WINDOW], dtype=np.float64)
+        ema_macd = np.empty((len(prices), len(spans) + 3))
+        multi_ema_macd(
+            prices.to_numpy(dtype=np.float64), 2.0 / (spans + 1.0),
+            2.0 / (12 + 1.0), 2.0 / (26 + 1.0), 2.0 / (9 + 1.0), ema_macd
+        )
+        features.update(zip(['trend_ema_short', 'trend_ema_medium', 'trend_ema_long'], ema_macd[:, :3].T))
+    else:
+        features['trend_ema_short'] = compute_ema(prices, SHORT_WINDOW)
+        features['trend_ema_medium'] = compute_ema(prices, MEDIUM_WINDOW)
+        features['trend_ema_long'] = compute_ema(prices, LONG_WINDOW)
     
     # Price distance from MAs (normalized)
     # (Price - MA) / MA
@@ -132,10 +164,13 @@ def build_trend_features(df: pd.DataFrame, price_col: str = "close") -> pd.DataF
     features['trend_dist_ema_long'] = (prices - features['trend_ema_long']) / features['trend_ema_long']
     
     # 2. MACD (Standard settings 12, 26, 9)
-    macd_df = compute_macd(prices, fast=12, slow=26, signal=9)
-    features['trend_macd_line'] = macd_df['macd_line']
-    features['trend_macd_signal'] = macd_df['macd_signal']
-    features['trend_macd_hist'] = macd_df['macd_hist']
+    if NUMBA_AVAILABLE:
+        features.update(zip(['trend_macd_line', 'trend_macd_signal', 'trend_macd_hist'], ema_macd[:, 3:].T))
+    else:
+        macd_df = compute_macd(prices, fast=12, slow=26, signal=9)
+        features['trend_macd_line'] = macd_df['macd_line']
+        features['trend_macd_signal'] = macd_df['macd_signal']
+        features['trend_macd_hist'] = macd_df['macd_hist']
     
     # 3. RSI
     features['trend_rsi_14'] = compute_rsi(prices, window=14)
@@ -143,4 +178,4 @@ def build_trend_features(df: pd.DataFrame, price_col: str = "close") -> pd.DataF
     # 4. ADX
     features['trend_adx_14'] = compute_adx(df, window=14)
     
-    return features
+    return pd.DataFrame(features, index=df.index)
@@ -11,6 +11,9 @@ Features included:
 import numpy as np
 import pandas as pd
 
+from src.utils.jit import NUMBA_AVAILABLE
+from src.features._kernels import rolling_return_stats, window_index, STAT_STD
+
 # Default rolling windows (consistent with returns.py)
 SHORT_WINDOW = 8     # ~1.5 days
 MEDIUM_WINDOW = 32   # ~5 days
@@ -20,7 +23,8 @@ def compute_log_returns(df: pd.DataFrame, price_col: str = "close") -> pd.Series
     """
     Compute log returns from close prices
     """
-    return np.log(df[price_col] / df[price_col].shift(1))
+    # One log pass and a difference, no intermediate price ratio
+    return np.log(df[price_col]).diff()
 
 def compute_realized_volatility(log_returns: pd.Series, window: int = SHORT_WINDOW) -> pd.Series:
     """
@@ -28,14 +32,29 @@ def compute_realized_volatility(log_returns: pd.Series, window: int = SHORT_WIND
     """
     return log_returns.rolling(window=window).std()
 
-def compute_parkinson_volatility(df: pd.DataFrame, window: int = SHORT_WINDOW) -> pd.Series:
+def compute_log_ranges(df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+    """
+    ln(H/L) and ln(C/O), from one log pass over each OHLC column.
+    """
+    log_open, log_high, log_low, log_close = (np.log(df[c].to_numpy(dtype=np.float64)) for c in ('open', 'high', 'low', 'close'))
+    log_hl = pd.Series(log_high - log_low, index=df.index)
+    log_co = pd.Series(log_close - log_open, index=df.index)
+    return log_hl, log_co
+
+def compute_parkinson_volatility(df: pd.DataFrame, window: int = SHORT_WINDOW, log_hl: pd.Series | None = None) -> pd.Series:
     """
     Parkinson volatility estimator based on High and Low prices.
     
     Formula: sigma = sqrt( (1 / (4 * ln(2))) * mean( ln(H/L)^2 ) )
+    
+    Args:
+        log_hl: Precomputed ln(H/L) of df (computed here if None)
     """
+    if log_hl is None:
+        log_hl, _ = compute_log_ranges(df)
+    
     # log(High / Low)^2
-    hl_ratio_sq = np.log(df['high'] / df['low']) ** 2
+    hl_ratio_sq = log_hl ** 2
     
     # Scaling factor
     const = 1.0 / (4.0 * np.log(2.0))
@@ -45,16 +64,20 @@ def compute_parkinson_volatility(df: pd.DataFrame, window: int = SHORT_WINDOW) -
     
     return np.sqrt(rolling_val)
 
-def compute_garman_klass_volatility(df: pd.DataFrame, window: int = SHORT_WINDOW) -> pd.Series:
+def compute_garman_klass_volatility(df: pd.DataFrame, window: int = SHORT_WINDOW,
+                                    log_hl: pd.Series | None = None, log_co: pd.Series | None = None) -> pd.Series:
     """
     Garman-Klass volatility estimator using OHLC.
     
     Formula includes opening jumps and high-low range.
+    
+    Args:
+        log_hl, log_co: Precomputed ln(H/L) and ln(C/O) of df (computed here if None)
     """
-    # 0.5 * ln(H/L)^2 - (2*ln(2) - 1) * ln(C/O)^2
-    log_hl = np.log(df['high'] / df['low'])
-    log_co = np.log(df['close'] / df['open'])
+    if log_hl is None or log_co is None:
+        log_hl, log_co = compute_log_ranges(df)
     
+    # 0.5 * ln(H/L)^2 - (2*ln(2) - 1) * ln(C/O)^2
     term1 = 0.5 * (log_hl ** 2)
     term2 = (2 * np.log(2) - 1) * (log_co ** 2)
     
@@ -69,29 +92,45 @@ def compute_vol_of_vol(realized_vol: pd.Series, window: int = SHORT_WINDOW) -> p
     """
     return realized_vol.rolling(window=window).std()
 
-def build_volatility_features(df: pd.DataFrame) -> pd.DataFrame:
+def build_volatility_features(df: pd.DataFrame, log_ret: pd.Series | None = None, stats: np.ndarray | None = None) -> pd.DataFrame:
     """
     Build all volatility-based features for a dataframe
+
+    Args:
+        df: Input dataframe with OHLCV data
+        log_ret: Precomputed log returns of df (computed here if None)
+        stats: Precomputed rolling_return_stats(log_ret) (computed here if None;
+            only used when numba is available)
     """
-    features = pd.DataFrame(index=df.index)
+    # Columns are collected as arrays and wrapped in a DataFrame once at the end
+    features = {}
     
-    log_ret = compute_log_returns(df)
+    if log_ret is None:
+        log_ret = compute_log_returns(df)
     
     # 1. Realized Volatility (Std Dev of Returns)
-    features['vol_realized_short'] = compute_realized_volatility(log_ret, SHORT_WINDOW)
-    features['vol_realized_medium'] = compute_realized_volatility(log_ret, MEDIUM_WINDOW)
-    features['vol_realized_long'] = compute_realized_volatility(log_ret, LONG_WINDOW)
+    if NUMBA_AVAILABLE:
+        if stats is None:
+            stats = rolling_return_stats(log_ret)
+        windows = [window_index(w) for w in (SHORT_WINDOW, MEDIUM_WINDOW, LONG_WINDOW)]
+        features.update(zip(['vol_realized_short', 'vol_realized_medium', 'vol_realized_long'], stats[:, windows, STAT_STD].T))
+    else:
+        features['vol_realized_short'] = compute_realized_volatility(log_ret, SHORT_WINDOW)
+        features['vol_realized_medium'] = compute_realized_volatility(log_ret, MEDIUM_WINDOW)
+        features['vol_realized_long'] = compute_realized_volatility(log_ret, LONG_WINDOW)
     
     # 2. High-Low Estimators
-    features['vol_parkinson_short'] = compute_parkinson_volatility(df, SHORT_WINDOW)
-    features['vol_parkinson_medium'] = compute_parkinson_volatility(df, MEDIUM_WINDOW)
+    # Both estimators share the same log ranges, so take the logs once
+    log_hl, log_co = compute_log_ranges(df)
+    features['vol_parkinson_short'] = compute_parkinson_volatility(df, SHORT_WINDOW, log_hl)
+    features['vol_parkinson_medium'] = compute_parkinson_volatility(df, MEDIUM_WINDOW, log_hl)
     
-    features['vol_gk_short'] = compute_garman_klass_volatility(df, SHORT_WINDOW)
-    features['vol_gk_medium'] = compute_garman_klass_volatility(df, MEDIUM_WINDOW)
+    features['vol_gk_short'] = compute_garman_klass_volatility(df, SHORT_WINDOW, log_hl, log_co)
+    features['vol_gk_medium'] = compute_garman_klass_volatility(df, MEDIUM_WINDOW, log_hl, log_co)
     
     # 3. Vol of Vol (Stability of volatility)
     # How volatile is the short-term volatility?
-    features['vol_of_vol_short'] = compute_vol_of_vol(features['vol_realized_short'], MEDIUM_WINDOW)
-    features['vol_of_vol_medium'] = compute_vol_of_vol(features['vol_realized_medium'], LONG_WINDOW)
+    features['vol_of_vol_short'] = compute_vol_of_vol(pd.Series(features['vol_realized_short'], index=df.index), MEDIUM_WINDOW)
+    features['vol_of_vol_medium'] = compute_vol_of_vol(pd.Series(features['vol_realized_medium'], index=df.index), LONG_WINDOW)
     
-    return features
+    return pd.DataFrame(features, index=df.index)
@@ -13,14 +13,20 @@ from src.data.cleaner import clean_ohlcv
 from src.data.fetcher import update_local_ohlcv
 from src.features.builder import build_features
 from src.regimes.inference import rolling_inference
+from src.regimes.diagnostics import compute_transition_matrix
 from src.strategies.robust import RobustTrendStrategy
 from src.risk.sizing import apply_vol_targeting
 from src.risk.limits import RiskLimits
 from src.backtest.engine import BacktestEngine
 from src.utils.logging import setup_logger
+from src.utils.jit import NUMBA_AVAILABLE
+from src.features._kernels import ewm_last
 
 logger = setup_logger("main")
 
+# Feature matrices are cached here, keyed by a hash of the OHLCV data
+FEATURE_CACHE_DIR = project_root / "data/processed/cache/features"
+
 def load_and_prep_data(filepath: str, update: bool = False):
     if update:
         logger.info("Updating local data from exchange...")
@@ -57,12 +63,9 @@ def run_backtest(args):
     df = load_and_prep_data(args.data)
     
     logger.info("Building features...")
-    features = build_features(df)
+    features = build_features(df, cache_dir=FEATURE_CACHE_DIR)
     features.dropna(inplace=True)
     
-    # Align df with features
-    df = df.loc[features.index]
-    
     logger.info(f"Running regime inference (window={args.window})...")
     regime_df = rolling_inference(
         features, 
@@ -71,7 +74,9 @@ def run_backtest(args):
         n_components=3, 
         sort_by='rolling_std_medium'
     )
-    df = df.join(regime_df)
+    # Align df with features and attach regimes in a single inner join
+    close = df['close']
+    df = df.join(regime_df, how='inner')
     
     logger.info("Executing strategy (RobustTrendStrategy)...")
     strategy = RobustTrendStrategy(
@@ -85,9 +90,8 @@ def run_backtest(args):
     # Check if close column exists (sanity check)
     if 'close' not in df.columns:
          logger.warning("'close' column missing after join, restoring...")
-         # Simple restoration if index aligns (it should)
-         df_raw = load_and_prep_data(args.data)
-         df['close'] = df_raw.loc[df.index, 'close']
+         # Restore from the pre-join frame instead of reloading the data
+         df['close'] = close.loc[df.index]
 
     signals = strategy.generate_signals(df, df['regime'])
     
@@ -134,7 +138,7 @@ def run_diagnose(args):
     df = load_and_prep_data(args.data)
     
     logger.info("Building features...")
-    features = build_features(df)
+    features = build_features(df, cache_dir=FEATURE_CACHE_DIR)
     features.dropna(inplace=True)
     
     logger.info(f"Running regime inference (window={args.window})...")
@@ -158,13 +162,7 @@ def run_diagnose(args):
     
     # Transition Matrix (approximate from rolling states)
     # This is a bit hacky since it's rolling, but gives an idea
-    states = regime_df['regime'].dropna().astype(int).values
-    transitions = np.zeros((3, 3))
-    for (s1, s2) in zip(states[:-1], states[1:]):
-        transitions[s1, s2] += 1
-    
-    # Normalize
-    trans_mat = transitions / transitions.sum(axis=1, keepdims=True)
+    trans_mat = compute_transition_matrix(regime_df['regime'], n_components=3)
     print("Transition Matrix (Empirical):")
     print(trans_mat)
     print("="*40 + "\n")
@@ -174,7 +172,7 @@ def run_live(args):
     df = load_and_prep_data(args.data, update=True)
     
     logger.info("Building features...")
-    features = build_features(df)
+    features = build_features(df, cache_dir=FEATURE_CACHE_DIR)
     features.dropna(inplace=True)
     
     # We need to ensure we have enough data for the window
@@ -190,12 +188,12 @@ def run_live(args):
         n_components=3, 
         sort_by='rolling_std_medium'
     )
-    df = df.join(regime_df)
-    
-    # Join ADX from features for display
+    # Join regimes and ADX from features (for display) in one pass
+    close = df['close']
+    to_join = [regime_df]
     if 'trend_adx_14' in features.columns:
-        df = df.join(features[['trend_adx_14']])
-        df.rename(columns={'trend_adx_14': 'adx'}, inplace=True)
+        to_join.append(features[['trend_adx_14']].rename(columns={'trend_adx_14': 'adx'}))
+    df = df.join(to_join)
     
     # Strategy
     strategy = RobustTrendStrategy(
@@ -208,8 +206,8 @@ def run_live(args):
     
     if 'close' not in df.columns:
          logger.warning("'close' column missing after join, restoring...")
-         df_raw = load_and_prep_data(args.data) # Reload from disk/cache
-         df['close'] = df_raw.loc[df.index, 'close']
+         # Restore from the pre-join frame; reloading would also miss freshly fetched candles
+         df['close'] = close.loc[df.index]
 
     signals = strategy.generate_signals(df, df['regime'])
     signals = signals.fillna(0.0)
@@ -236,12 +234,20 @@ def run_live(args):
     print(f"LIVE SIGNAL ANALYSIS: {last_idx}")
     print("="*40)
     print(f"Latest Close:   ${last_row['close']:,.2f}")
-    print(f"Regime:         {int(last_row['regime'])} (Prob: {last_row[f'regime_proba_{int(last_row['regime'])}']:.2f})")
+    last_regime = int(last_row['regime'])
+    print(f"Regime:         {last_regime} (Prob: {last_row[f'regime_proba_{last_regime}']:.2f})")
     print("-" * 40)
     
     # Debug info
-    ema_fast = df['close'].ewm(span=20, adjust=False).mean().iloc[-1]
-    ema_slow = df['close'].ewm(span=50, adjust=False).mean().iloc[-1]
+    # Only the latest EMA values are displayed, so fold the history into a scalar
+    # instead of building the full EWM series
+    if NUMBA_AVAILABLE:
+        close = df['close'].to_numpy(dtype=np.float64)
+        ema_fast = ewm_last(close, 2.0 / (20 + 1), False)
+        ema_slow = ewm_last(close, 2.0 / (50 + 1), False)
+    else:
+        ema_fast = df['close'].ewm(span=20, adjust=False).mean().iloc[-1]
+        ema_slow = df['close'].ewm(span=50, adjust=False).mean().iloc[-1]
     # Re-calc ADX locally or assume it's in features if we saved it?
     # build_features returns all features, ADX should be there.
     # Let's check feature columns if needed, but for now just print raw signal.
@@ -0,0 +1,43 @@
+"""
+Numba kernels for regime inference.
+
+Always imported as `src.regimes._kernels` (see src/utils/jit.py).
+"""
+
+import numpy as np
+
+from src.utils.jit import njit
+
+@njit(cache=True)
+def forward_filter_last(log_startprob, log_transmat, framelogprob):
+    """
+    Filtered state probabilities P(S_T | X_1..X_T) at the last row of
+    `framelogprob` (shape (T, K) per-row log emission densities), by a forward
+    pass in log space (Numba kernel).
+
+    This equals the last row of the forward-backward posteriors, since the
+    backward message is 1 at the end of the sequence.
+    """
+    n, k_count = framelogprob.shape
+    alpha = log_startprob + framelogprob[0]
+    work = np.empty(k_count)
+    for t in range(1, n):
+        prev = alpha.copy()
+        for j in range(k_count):
+            # logsumexp over the previous states
+            m = -np.inf
+            for i in range(k_count):
+                work[i] = prev[i] + log_transmat[i, j]
+                if work[i] > m:
+                    m = work[i]
+            if m == -np.inf:
+                alpha[j] = -np.inf
+            else:
+                acc = 0.0
+                for i in range(k_count):
+                    acc += np.exp(work[i] - m)
+                alpha[j] = m + np.log(acc) + framelogprob[t, j]
+    
+    m = alpha.max()
+    out = np.exp(alpha - m)
+    return out / out.sum()
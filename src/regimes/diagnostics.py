@@ -4,9 +4,9 @@ import matplotlib.pyplot as plt
 
 def compute_transition_matrix(states: pd.Series, n_components: int) -> pd.DataFrame:
     s = states.dropna().astype(int).values
-    mat = np.zeros((n_components, n_components), dtype=float)
-    for i in range(len(s) - 1):
-        mat[s[i], s[i + 1]] += 1.0
+    # Count (from, to) pairs in one bincount over the flattened pair index
+    flat = s[:-1] * n_components + s[1:]
+    mat = np.bincount(flat, minlength=n_components * n_components).reshape(n_components, n_components).astype(float)
     row_sums = mat.sum(axis=1, keepdims=True)
     row_sums[row_sums == 0] = 1.0
     mat = mat / row_sums
@@ -14,29 +14,14 @@ def compute_transition_matrix(states: pd.Series, n_components: int) -> pd.DataFr
     return pd.DataFrame(mat, index=idx, columns=idx)
 
 def compute_state_durations(states: pd.Series, n_components: int) -> pd.DataFrame:
-    s = states.copy()
-    durations = {i: [] for i in range(n_components)}
-    current_state = None
-    current_len = 0
-    for x in s:
-        if np.isnan(x):
-            if current_state is not None and current_len > 0:
-                durations[int(current_state)].append(current_len)
-            current_state = None
-            current_len = 0
-            continue
-        x = int(x)
-        if current_state is None:
-            current_state = x
-            current_len = 1
-        elif x == current_state:
-            current_len += 1
-        else:
-            durations[int(current_state)].append(current_len)
-            current_state = x
-            current_len = 1
-    if current_state is not None and current_len > 0:
-        durations[int(current_state)].append(current_len)
+    # Run-length encode the labels: a run starts wherever the label changes.
+    # NaN != NaN, so every NaN is its own run and is dropped below, which also
+    # splits runs on either side of a gap.
+    s = states.to_numpy(dtype=float)
+    starts = np.flatnonzero(np.concatenate((np.ones(min(len(s), 1), dtype=bool), s[1:] != s[:-1])))
+    lengths = np.diff(np.append(starts, len(s)))
+    run_states = s[starts]
+    durations = {i: lengths[run_states == i] for i in range(n_components)}
     data = {
         "mean_duration": [np.mean(durations[i]) if len(durations[i]) > 0 else np.nan for i in range(n_components)],
         "median_duration": [np.median(durations[i]) if len(durations[i]) > 0 else np.nan for i in range(n_components)],
@@ -52,11 +37,12 @@ def compute_regime_stats(features: pd.DataFrame, regimes: pd.DataFrame) -> dict:
     durations = compute_state_durations(states, n_components)
     counts = states.value_counts(dropna=True).sort_index()
     counts = counts.reindex(range(n_components)).fillna(0).astype(int)
+    # One groupby pass for all states instead of a masked scan per state
+    grouped = features.groupby(states, dropna=True).mean(numeric_only=True)
     per_state_means = {}
     for i in range(n_components):
-        mask = states == i
-        if mask.any():
-            per_state_means[f"r{i}"] = features.loc[mask].mean(numeric_only=True)
+        if i in grouped.index:
+            per_state_means[f"r{i}"] = grouped.loc[i].rename(None)
         else:
             per_state_means[f"r{i}"] = pd.Series(dtype=float)
     return {
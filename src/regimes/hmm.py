@@ -21,18 +21,22 @@ class RegimeHMM:
     Wrapper around hmmlearn.hmm.GaussianHMM to handle data scaling, dimensionality reduction, and model persistence.
     """
     
-    def __init__(self, n_components: int = 3, covariance_type: str = "full", n_iter: int = 100, tol: float = 1e-2, min_covar: float = 1e-3, n_pca_components: int | None = None, random_state: int = 42):
+    def __init__(self, n_components: int = 3, covariance_type: str = "diag", n_iter: int = 100, tol: float = 1e-2, min_covar: float = 1e-3, n_pca_components: int | None = None, random_state: int = 42, use_fp32: bool = True):
         """
         Initialize the HMM model.
         
         Args:
             n_components: Number of regimes (hidden states)
-            covariance_type: Type of covariance parameters ('full', 'diag', 'spherical', 'tied')
+            covariance_type: Type of covariance parameters ('full', 'diag', 'spherical', 'tied').
+               'diag' avoids per-state matrix inversions in EM; PCA components are
+               already uncorrelated over the window, so little structure is lost.
             n_iter: Maximum number of iterations for the EM algorithm
             tol: Convergence threshold
             min_covar: Floor on the diagonal of the covariance matrix to prevent overfitting.
             n_pca_components: Number of PCA components to keep. If None, no PCA is applied.
             random_state: Seed for reproducibility
+            use_fp32: Run scaling and PCA in float32, halving memory traffic. hmmlearn
+               still evaluates emissions and runs EM in float64.
         """
         self.n_components = n_components
         self.covariance_type = covariance_type
@@ -41,16 +45,20 @@ class RegimeHMM:
         self.min_covar = min_covar
         self.n_pca_components = n_pca_components
         self.random_state = random_state
+        self.use_fp32 = use_fp32
         
         self.model = None
         self.scaler = StandardScaler()
         self.pca = None
         if self.n_pca_components is not None:
-            self.pca = PCA(n_components=self.n_pca_components, random_state=random_state)
+            # Windows are tall (n_samples >> n_features), so an eigendecomposition of the
+            # symmetric p x p covariance is cheaper and more stable than a full SVD
+            self.pca = PCA(n_components=self.n_pca_components, svd_solver="covariance_eigh", random_state=random_state)
             
         self._is_fitted = False
+        self._proj = None
 
-    def fit(self, X: pd.DataFrame | np.ndarray):
+    def fit(self, X: pd.DataFrame | np.ndarray, init_from: 'RegimeHMM | None' = None):
         """
         Fit the HMM to the provided data.
         Data is automatically standardized (Z-score) before fitting.
@@ -58,6 +66,12 @@ class RegimeHMM:
         Args:
             X: Feature matrix (n_samples, n_features). Can be DataFrame or numpy array.
                Must not contain NaNs.
+            init_from: Optional previously fitted model to warm-start EM from.
+               Its state assignments on X seed the initial means/covariances
+               (computed in this model's scaled/PCA space) and its start and
+               transition probabilities are reused, so EM converges in a few
+               iterations on slowly drifting data. Falls back to a cold start
+               if any state would be seeded from fewer than 2 samples.
         """
         # Convert to numpy if needed
         data = self._validate_input(X)
@@ -69,6 +83,10 @@ class RegimeHMM:
         if self.pca is not None:
             data_scaled = self.pca.fit_transform(data_scaled)
         
+        warm_params = None
+        if init_from is not None:
+            warm_params = self._warm_start_params(init_from, data, data_scaled)
+        
         # Initialize and fit HMM
         self.model = GaussianHMM(
             n_components=self.n_components,
@@ -82,10 +100,67 @@ class RegimeHMM:
             params='stmc'
         )
         
+        if warm_params is not None:
+            startprob, transmat, means, covars = warm_params
+            self.model.startprob_ = startprob
+            self.model.transmat_ = transmat
+            self.model.means_ = means
+            self.model.covars_ = covars
+            self.model.init_params = ''
+        
         self.model.fit(data_scaled)
         self._is_fitted = True
+        self._set_projection()
         return self
 
+    def _set_projection(self):
+        """
+        Fold the fitted scaler and PCA into one affine map, data @ W + b, so that
+        transforming new data is a single matmul without sklearn's per-call validation.
+        """
+        inv_scale = 1.0 / self.scaler.scale_
+        if self.pca is None:
+            self._proj = (np.diag(inv_scale), -self.scaler.mean_ * inv_scale)
+        else:
+            components_t = self.pca.components_.T
+            W = components_t * inv_scale[:, None]
+            b = -(self.scaler.mean_ * inv_scale + self.pca.mean_) @ components_t
+            self._proj = (W, b)
+        if self.use_fp32:
+            self._proj = tuple(a.astype(np.float32) for a in self._proj)
+
+    def _warm_start_params(self, prev: 'RegimeHMM', data: np.ndarray, data_scaled: np.ndarray):
+        """
+        Derive initial HMM parameters for `data_scaled` from a previously fitted model.
+        Returns None if a warm start is not possible.
+        """
+        if not prev._is_fitted or prev.n_components != self.n_components:
+            return None
+        
+        labels = prev.model.predict(prev._transform(data))
+        n_features = data_scaled.shape[1]
+        
+        means = np.empty((self.n_components, n_features))
+        full_covars = np.empty((self.n_components, n_features, n_features))
+        for s in range(self.n_components):
+            x = data_scaled[labels == s]
+            if len(x) < 2:
+                return None
+            means[s] = x.mean(axis=0)
+            full_covars[s] = np.atleast_2d(np.cov(x, rowvar=False)) + self.min_covar * np.eye(n_features)
+        
+        if self.covariance_type == "full":
+            covars = full_covars
+        elif self.covariance_type == "diag":
+            covars = np.diagonal(full_covars, axis1=1, axis2=2).copy()
+        elif self.covariance_type == "spherical":
+            covars = np.diagonal(full_covars, axis1=1, axis2=2).mean(axis=1)
+        else:  # tied
+            counts = np.bincount(labels, minlength=self.n_components)
+            covars = np.tensordot(counts / counts.sum(), full_covars, axes=1)
+        
+        return prev.model.startprob_.copy(), prev.model.transmat_.copy(), means, covars
+
     def predict(self, X: pd.DataFrame | np.ndarray) -> np.ndarray:
         """
         Infer the most likely sequence of hidden states.
@@ -97,12 +172,7 @@ class RegimeHMM:
             raise ValueError("Model is not fitted. Call fit() first.")
             
         data = self._validate_input(X)
-        data_scaled = self.scaler.transform(data)
-        
-        if self.pca is not None:
-            data_scaled = self.pca.transform(data_scaled)
-        
-        return self.model.predict(data_scaled)
+        return self.model.predict(self._transform(data))
 
     def predict_proba(self, X: pd.DataFrame | np.ndarray) -> np.ndarray:
         """
@@ -115,12 +185,37 @@ class RegimeHMM:
             raise ValueError("Model is not fitted. Call fit() first.")
             
         data = self._validate_input(X)
+        return self.model.predict_proba(self._transform(data))
+
+    def log_emissions(self, X: pd.DataFrame | np.ndarray) -> np.ndarray:
+        """
+        Log emission density of each sample under each state.
+        
+        Returns:
+            Array of shape (n_samples, n_components)
+        """
+        if not self._is_fitted:
+            raise ValueError("Model is not fitted. Call fit() first.")
+            
+        data = self._validate_input(X)
+        return self.model._compute_log_likelihood(self._transform(data))
+
+    def _transform(self, data: np.ndarray) -> np.ndarray:
+        """
+        Apply the fitted scaler (and PCA, if configured) to validated data.
+        """
+        proj = getattr(self, "_proj", None)
+        if proj is not None:
+            W, b = proj
+            return data @ W + b
+        
+        # Models saved before the folded projection existed
         data_scaled = self.scaler.transform(data)
         
         if self.pca is not None:
             data_scaled = self.pca.transform(data_scaled)
         
-        return self.model.predict_proba(data_scaled)
+        return data_scaled
 
     def _validate_input(self, X) -> np.ndarray:
         """
@@ -134,6 +229,9 @@ class RegimeHMM:
         # Check for NaNs or Infs
         if np.isnan(data).any() or np.isinf(data).any():
             raise ValueError("Input data contains NaNs or Infs. Please handle missing values before passing to HMM.")
+        
+        if getattr(self, "use_fp32", False):
+            data = data.astype(np.float32, copy=False)
             
         return data
 
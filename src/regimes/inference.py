@@ -1,32 +1,82 @@
 import numpy as np
 import pandas as pd
+import sys
 import warnings
+from joblib import Parallel, delayed
 from tqdm import tqdm
 from .hmm import RegimeHMM
+from src.regimes._kernels import forward_filter_last
 
-def rolling_inference(features: pd.DataFrame, n_components: int = 3, covariance_type: str = "full", n_iter: int = 100, tol: float = 1e-2, min_covar: float = 1e-3, window: int = 512, smooth_alpha: float | None = None, n_pca_components: int | None = 10, on_error: str = "carry", refit_interval: int = 1, sort_by: str | None = None, verbose: bool = True, random_state: int = 42) -> pd.DataFrame:
+def _fit_window(data: np.ndarray, init_from: RegimeHMM | None, hmm_kwargs: dict) -> RegimeHMM | Exception:
+    """
+    Fit a RegimeHMM on one window. A failed fit is returned rather than raised,
+    so fits prepared by parallel workers fail at the same step as sequential ones.
+    """
+    hmm = RegimeHMM(**hmm_kwargs)
+    
+    # Suppress convergence warnings for cleaner CLI output
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="Model is not converging")
+        try:
+            return hmm.fit(data, init_from=init_from)
+        except Exception as e:
+            return e
+
+def rolling_inference(features: pd.DataFrame, n_components: int = 3, covariance_type: str = "diag", n_iter: int = 100, tol: float = 1e-2, min_covar: float = 1e-3, window: int = 512, smooth_alpha: float | None = None, n_pca_components: int | None = 10, on_error: str = "carry", refit_interval: int = 1, sort_by: str | None = None, verbose: bool = True, random_state: int = 42, warm_start: bool = False, warm_n_iter: int = 20, warm_tol: float = 5e-2, cold_refit_every: int | None = 10, n_jobs: int | None = None, use_fp32: bool = True) -> pd.DataFrame:
     if not isinstance(features, pd.DataFrame):
         raise ValueError("features must be a pandas DataFrame")
     if window <= 1:
         raise ValueError("window must be > 1")
     idx = features.index
     n = len(features)
-    result = pd.DataFrame(index=idx)
-    result["regime"] = np.nan
-    proba_cols = [f"regime_proba_{i}" for i in range(n_components)]
-    for c in proba_cols:
-        result[c] = np.nan
+    # Probabilities are written into a plain array; labels are derived and the
+    # DataFrame is built once at the end
+    proba_arr = np.full((n, n_components), np.nan)
     prev_smooth = None
     last_fitted_hmm = None
     last_sorted_map = None
+    n_refits = 0
+    
+    hmm_kwargs = dict(n_components=n_components, covariance_type=covariance_type, n_iter=n_iter, tol=tol, min_covar=min_covar, n_pca_components=n_pca_components, random_state=random_state, use_fp32=use_fp32)
+    
+    # Convert once and slice views per step instead of copying a DataFrame window
+    arr = features.to_numpy(dtype=np.float32 if use_fp32 else np.float64)
+    nanrow = np.isnan(arr).any(axis=1)
+    infrow = np.isinf(arr).any(axis=1)
+    sort_col = features.columns.get_loc(sort_by) if sort_by is not None and sort_by in features.columns else None
+    
+    # Only the last row's posterior is used, which is the forward-filtered probability,
+    # so each step only needs a forward pass over the window's log emissions. Emissions
+    # are row-wise, so they are computed in one batch up to the next scheduled refit
+    # and cached until then.
+    frame_lp = np.empty((n, n_components))
+    lp_filled = np.zeros(n, dtype=bool)
+    log_startprob = log_transmat = None
+    
+    # Cold refits are independent of each other, so with n_jobs the scheduled ones are
+    # fitted up front in parallel; the loop below then only picks them up. Warm starts
+    # chain each fit to the previous one and always run sequentially.
+    prefit = {}
+    if n_jobs not in (None, 1) and not warm_start:
+        n_valid = np.concatenate(([0], np.cumsum(~nanrow)))
+        refit_ts = [t for t in range(window - 1, n, refit_interval) if n_valid[t + 1] - n_valid[t - window + 1] >= 2]
+        fits = Parallel(n_jobs=n_jobs, backend="loky")(
+            delayed(_fit_window)(arr[t - window + 1 : t + 1][~nanrow[t - window + 1 : t + 1]], None, hmm_kwargs)
+            for t in refit_ts
+        )
+        prefit = dict(zip(refit_ts, fits))
     
     iterator = range(window - 1, n)
-    if verbose:
-        iterator = tqdm(iterator, desc="Rolling Inference", mininterval=1.0)
+    # Progress bars only help on a terminal; in logs and CI iterate the plain range.
+    # miniters bounds how often tqdm even checks the clock to ~200 times per run
+    if verbose and sys.stderr.isatty():
+        iterator = tqdm(iterator, desc="Rolling Inference", mininterval=1.0, miniters=max(1, len(iterator) // 200))
         
     for t in iterator:
-        window_df = features.iloc[t - window + 1 : t + 1].dropna()
-        if len(window_df) < 2:
+        sl = slice(t - window + 1, t + 1)
+        valid = ~nanrow[sl]
+        window_arr = arr[sl] if valid.all() else arr[sl][valid]
+        if len(window_arr) < 2:
             continue
         
         # Decide whether to refit
@@ -40,40 +90,64 @@ def rolling_inference(features: pd.DataFrame, n_components: int = 3, covariance_
         
         try:
             if should_refit:
-                hmm = RegimeHMM(n_components=n_components, covariance_type=covariance_type, n_iter=n_iter, tol=tol, min_covar=min_covar, n_pca_components=n_pca_components, random_state=random_state)
-                
-                # Suppress convergence warnings for cleaner CLI output
-                with warnings.catch_warnings():
-                    warnings.filterwarnings("ignore", message="Model is not converging")
-                    hmm.fit(window_df)
+                # Warm-started refits start close to the optimum, so they get a shorter,
+                # looser EM run; every cold_refit_every-th refit is a full cold start
+                # so the chain of warm starts cannot drift indefinitely
+                warm = warm_start and last_fitted_hmm is not None and not (cold_refit_every and n_refits % cold_refit_every == 0)
+                if warm:
+                    hmm = _fit_window(window_arr, last_fitted_hmm, dict(hmm_kwargs, n_iter=warm_n_iter, tol=warm_tol))
+                elif t in prefit:
+                    hmm = prefit.pop(t)
+                else:
+                    hmm = _fit_window(window_arr, None, hmm_kwargs)
+                if isinstance(hmm, Exception):
+                    raise hmm
                 
                 last_fitted_hmm = hmm
+                n_refits += 1
+                lp_filled[:] = False
+                with np.errstate(divide="ignore"):
+                    log_startprob = np.log(hmm.model.startprob_)
+                    log_transmat = np.log(hmm.model.transmat_)
                 
                 # Compute sorting map if requested
-                if sort_by is not None and sort_by in window_df.columns:
-                    # Predict states on the training window to determine their properties
-                    states = hmm.predict(window_df)
-                    state_means = []
-                    for s in range(n_components):
-                        mask = states == s
-                        if mask.any():
-                            val = window_df.loc[window_df.index[mask], sort_by].mean()
-                        else:
-                            # Push unused states to the end (infinity)
-                            val = np.inf 
-                        state_means.append(val)
+                if sort_col is not None:
+                    if n_pca_components is None:
+                        # The HMM runs on standardized features, a per-column increasing
+                        # map, so the fitted state means already rank the states
+                        state_means = hmm.model.means_[:, sort_col]
+                    else:
+                        # PCA mixes the columns: predict states on the training window
+                        # and rank them by the raw column's mean under each label
+                        states = hmm.predict(window_arr)
+                        state_means = []
+                        for s in range(n_components):
+                            mask = states == s
+                            if mask.any():
+                                val = window_arr[mask, sort_col].mean()
+                            else:
+                                # Push unused states to the end (infinity)
+                                val = np.inf
+                            state_means.append(val)
                     last_sorted_map = np.argsort(state_means)
                 else:
                     last_sorted_map = None
             
-            # Use the last fitted model (or the one just fitted) to predict for the current window
-            probas = last_fitted_hmm.predict_proba(window_df)
+            # Use the last fitted model (or the one just fitted) to filter the current window
+            if infrow[sl].any():
+                raise ValueError("Input data contains Infs.")
+            rows = np.arange(sl.start, sl.stop)[valid]
+            if not lp_filled[rows].all():
+                next_refit = t + refit_interval - (t - (window - 1)) % refit_interval
+                ahead = np.arange(sl.start, min(n, next_refit))
+                ahead = ahead[~(nanrow[ahead] | infrow[ahead] | lp_filled[ahead])]
+                frame_lp[ahead] = last_fitted_hmm.log_emissions(arr[ahead])
+                lp_filled[ahead] = True
+            p_t = forward_filter_last(log_startprob, log_transmat, frame_lp[rows])
             
             # Reorder probabilities based on the sorted map
             if last_sorted_map is not None:
-                probas = probas[:, last_sorted_map]
-                
-            p_t = probas[-1]
+                p_t = p_t[last_sorted_map]
             
             if np.isnan(p_t).any():
                 if on_error == "carry" and prev_smooth is not None:
@@ -87,18 +161,18 @@ def rolling_inference(features: pd.DataFrame, n_components: int = 3, covariance_
             # Update prev_smooth only if valid
             if not np.isnan(p_t).any():
                 prev_smooth = p_t
-                state_t = int(np.argmax(p_t))
-                result.iloc[t, result.columns.get_loc("regime")] = state_t
-                for i in range(n_components):
-                    result.iloc[t, result.columns.get_loc(f"regime_proba_{i}")] = p_t[i]
+                proba_arr[t] = p_t
                     
         except Exception:
             if on_error == "carry" and prev_smooth is not None:
                 p_t = prev_smooth
-                state_t = int(np.argmax(p_t))
-                result.iloc[t, result.columns.get_loc("regime")] = state_t
-                for i in range(n_components):
-                    result.iloc[t, result.columns.get_loc(f"regime_proba_{i}")] = p_t[i]
+                proba_arr[t] = p_t
             else:
                 continue
-    return result
+    
+    valid = ~np.isnan(proba_arr).any(axis=1)
+    regime_arr = np.where(valid, proba_arr.argmax(axis=1), np.nan)
+    
+    result = {"regime": regime_arr}
+    result.update({f"regime_proba_{i}": proba_arr[:, i] for i in range(n_components)})
+    return pd.DataFrame(result, index=idx)
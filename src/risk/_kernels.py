@@ -0,0 +1,80 @@
+"""
+Numba kernels for the risk controls.
+
+Always imported as `src.risk._kernels` (see src/utils/jit.py).
+"""
+
+import numpy as np
+
+from src.utils.jit import njit
+
+@njit(cache=True)
+def apply_cooldown(signals, breach, cooldown_bars):
+    """
+    Copy of `signals` forced to 0.0 on every breach bar and for the
+    `cooldown_bars` bars following it (Numba kernel).
+    Breaches during a cooldown do not extend it.
+    """
+    out = signals.copy()
+    cooldown_counter = 0
+    for i in range(len(signals)):
+        # Check if we are in cooldown from previous breach
+        if cooldown_counter > 0:
+            out[i] = 0.0
+            cooldown_counter -= 1
+        elif breach[i]:
+            out[i] = 0.0
+            cooldown_counter = cooldown_bars
+    return out
+
+@njit(cache=True)
+def rolling_vol_ffill(returns, window, annualization):
+    """
+    Rolling sample std of `returns` times `annualization`, with zero
+    volatility forward-filled from the last non-zero value (Numba kernel).
+    One online (Welford add/remove) pass; NaN until `window` returns are seen.
+    Like pandas, a window of identical values has exactly zero variance.
+    """
+    n = len(returns)
+    out = np.full(n, np.nan)
+    if window < 2:
+        return out
+    
+    nobs = 0
+    mean = 0.0
+    m2 = 0.0
+    same_run = 0
+    last_vol = np.nan
+    for i in range(n):
+        # Drop the value leaving the window
+        if i >= window:
+            y = returns[i - window]
+            nobs -= 1
+            delta = y - mean
+            mean -= delta / nobs
+            m2 -= delta * (y - mean)
+        
+        # Add the incoming value
+        x = returns[i]
+        nobs += 1
+        delta = x - mean
+        mean += delta / nobs
+        m2 += delta * (x - mean)
+        
+        if i > 0 and x == returns[i - 1]:
+            same_run += 1
+        else:
+            same_run = 1
+        
+        if i < window - 1:
+            continue
+        if same_run >= window or m2 <= 0.0:
+            vol = 0.0
+        else:
+            vol = np.sqrt(m2 / (nobs - 1)) * annualization
+        
+        # Zero volatility would divide by zero downstream: carry the last value
+        if vol != 0.0:
+            last_vol = vol
+        out[i] = last_vol
+    return out
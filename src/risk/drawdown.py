@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from src.risk._kernels import apply_cooldown
+
 class DrawdownControl:
     """
     Implements a Circuit Breaker that halts trading if drawdown exceeds a threshold.
@@ -34,27 +36,15 @@ class DrawdownControl:
         breach_mask = drawdown < -self.max_drawdown_limit
         
         # Apply cooldown logic
-        # If breach happens at t, we want to be flat for [t+1, t+cooldown]
-        # This is iterative, hard to vectorize perfectly without a loop, 
-        # but we can try a forward fill approach or just a simple loop.
-        
-        # Let's use a loop for safety and clarity as this is critical logic.
+        # If breach happens at t, we want to be flat for [t, t+cooldown].
+        # Each bar depends on the cooldown state left by the previous ones, so this
+        # stays a sequential loop, run as a compiled kernel over raw arrays.
+        # Note: In a real backtest, we'd check yesterday's close equity.
+        # Here we assume equity_curve is aligned with signals (known at t).
+        modified = apply_cooldown(
+            signals.to_numpy(dtype=np.float64),
+            breach_mask.to_numpy(dtype=np.bool_),
+            self.cooldown_bars
+        )
         
-        modified_signals = signals.copy()
-        cooldown_counter = 0
-        
-        for i in range(len(signals)):
-            # Check if we are in cooldown from previous breach
-            if cooldown_counter > 0:
-                modified_signals.iloc[i] = 0.0
-                cooldown_counter -= 1
-                continue
-            
-            # Check for new breach at current step
-            # Note: In a real backtest, we'd check yesterday's close equity.
-            # Here we assume equity_curve is aligned with signals (known at t).
-            if breach_mask.iloc[i]:
-                modified_signals.iloc[i] = 0.0
-                cooldown_counter = self.cooldown_bars
-                
-        return modified_signals
+        return pd.Series(modified, index=signals.index, name=signals.name)
@@ -23,14 +23,12 @@ class RiskLimits:
             signals: Target position sizes (e.g., 1.2, -0.5, 2.0).
             
         Returns:
-            pd.Series: Signals clipped to [-max_leverage, max_leverage].
+            pd.Series: Signals clipped to [-bound, bound], bound = min(max_leverage, max_position_size).
         """
-        # 1. Clip absolute size to max_leverage
-        clipped_signals = signals.clip(lower=-self.max_leverage, upper=self.max_leverage)
+        # Since this is single-asset (BTC), max_leverage and max_position_size are effectively
+        # the same bound, so clip once to the tighter of the two.
+        # (In a multi-asset system, we would check max_position_size per asset.)
+        bound = min(self.max_leverage, self.max_position_size)
+        clipped = np.clip(signals.to_numpy(), -bound, bound)
         
-        # 2. (Optional) In a multi-asset system, we would check max_position_size per asset.
-        # Since this is single-asset (BTC), max_leverage and max_position_size are effectively the same.
-        # But for correctness:
-        clipped_signals = clipped_signals.clip(lower=-self.max_position_size, upper=self.max_position_size)
-        
-        return clipped_signals
+        return pd.Series(clipped, index=signals.index, name=signals.name)
@@ -0,0 +1,170 @@
+"""
+Numba kernels for the strategy state machines.
+
+Responsibilities:
+- Position state machines that depend on the previous bar's position
+  (entries, exits and forced exits outside the strategy's regime)
+- A vectorized NumPy equivalent for environments without numba
+- Single-pass indicator inputs (rolling z-score)
+
+Always imported as `src.strategies._kernels` (see src/utils/jit.py).
+"""
+
+import numpy as np
+
+from src.utils.jit import njit
+
+@njit(cache=True, nogil=True)
+def mean_reversion_positions(z_score, in_regime, z_threshold):
+    """
+    Positions of MeanReversionStrategy over raw arrays (Numba kernel).
+    Long below -z_threshold, short above +z_threshold, exit when z crosses 0,
+    flat whenever in_regime is False. NaN z-scores neither enter nor exit.
+    """
+    n = len(z_score)
+    out = np.empty(n, dtype=np.int8)
+    current_pos = 0
+    for i in range(n):
+        if not in_regime[i]:
+            current_pos = 0 # Force exit if regime changes
+        else:
+            z = z_score[i]
+            if current_pos == 0:
+                if z < -z_threshold:
+                    current_pos = 1 # Long
+                elif z > z_threshold:
+                    current_pos = -1 # Short
+            elif current_pos == 1:
+                if z >= 0: # Exit condition
+                    current_pos = 0
+            elif current_pos == -1:
+                if z <= 0: # Exit condition
+                    current_pos = 0
+        out[i] = current_pos
+    return out
+
+@njit(cache=True, nogil=True)
+def breakout_positions(close, rolling_max, rolling_min, rolling_mean, in_regime):
+    """
+    Positions of RegimeBreakoutStrategy over raw arrays (Numba kernel).
+    Long above the prior channel high, short below the prior channel low,
+    exit when price crosses back through the rolling mean, flat whenever
+    in_regime is False.
+    """
+    n = len(close)
+    out = np.empty(n, dtype=np.int8)
+    current_pos = 0
+    for i in range(n):
+        if not in_regime[i]:
+            current_pos = 0 # Force exit
+        else:
+            price = close[i]
+            if current_pos == 0:
+                if price > rolling_max[i]:
+                    current_pos = 1
+                elif price < rolling_min[i]:
+                    current_pos = -1
+            elif current_pos == 1:
+                if price < rolling_mean[i]: # Trailing stop at mean
+                    current_pos = 0
+            elif current_pos == -1:
+                if price > rolling_mean[i]: # Trailing stop at mean
+                    current_pos = 0
+        out[i] = current_pos
+    return out
+
+@njit(cache=True, nogil=True)
+def rolling_zscore(x, window):
+    """
+    (x - rolling mean) / rolling sample std over `window` bars in one online
+    (Welford add/remove) pass (Numba kernel). Matches pandas rolling(window):
+    NaN until the window is full or while it holds a NaN, and a window of
+    identical values has zero std (so z is NaN).
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    if window < 2:
+        return out
+    
+    nobs = 0
+    n_nan = 0
+    mean = 0.0
+    m2 = 0.0
+    same_run = 0
+    for i in range(n):
+        # Drop the value leaving the window
+        if i >= window:
+            y = x[i - window]
+            if np.isnan(y):
+                n_nan -= 1
+            else:
+                nobs -= 1
+                if nobs == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    delta = y - mean
+                    mean -= delta / nobs
+                    m2 -= delta * (y - mean)
+        
+        # Add the incoming value
+        v = x[i]
+        if np.isnan(v):
+            n_nan += 1
+            same_run = 0
+        else:
+            nobs += 1
+            delta = v - mean
+            mean += delta / nobs
+            m2 += delta * (v - mean)
+            if i > 0 and v == x[i - 1]:
+                same_run += 1
+            else:
+                same_run = 1
+        
+        if i < window - 1 or n_nan > 0:
+            continue
+        if same_run >= window:
+            continue # Flat window: 0 / 0
+        std = np.sqrt(max(m2, 0.0) / (nobs - 1))
+        out[i] = (v - mean) / std
+    return out
+
+def state_positions_np(enter_long, enter_short, exit_long, exit_short) -> np.ndarray:
+    """
+    Vectorized equivalent of the state-machine kernels (NumPy fallback when numba
+    is unavailable).
+
+    From flat, enter_long opens a long (winning over enter_short) and
+    enter_short a short; a long closes on exit_long and a short on exit_short.
+    An entry against an open position is "blocked": it opens nothing. Entries
+    must not coincide with their own side's exit, which holds for both
+    strategies on well-formed bars.
+
+    Given the blocked entries, long and short are each a forward fill of
+    "open at entry, close at exit". Blocked entries depend on the previous
+    position, so they are found by fixed-point iteration; each pass settles at
+    least the earliest wrong bar, and in practice two or three passes suffice.
+    """
+    n = len(enter_long)
+    idx = np.arange(n)
+    blocked = np.zeros(n, dtype=bool)
+    enter_short = enter_short & ~enter_long
+    while True:
+        long_held = _held(enter_long & ~blocked, exit_long, idx)
+        short_held = _held(enter_short & ~blocked, exit_short, idx)
+        pos = long_held.astype(np.int8) - short_held.astype(np.int8)
+
+        prev = np.concatenate(([0], pos[:-1]))
+        new_blocked = (enter_long & (prev == -1)) | (enter_short & (prev == 1))
+        if np.array_equal(new_blocked, blocked):
+            return pos
+        blocked = new_blocked
+
+def _held(enter, exit, idx) -> np.ndarray:
+    """
+    True where the most recent enter/exit event at or before each bar is an enter.
+    """
+    event = enter | exit
+    last_event = np.maximum.accumulate(np.where(event, idx, -1))
+    return (last_event >= 0) & enter[np.maximum(last_event, 0)]
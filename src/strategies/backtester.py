@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
 class VectorizedBacktester:
     """
@@ -8,6 +7,11 @@ class VectorizedBacktester:
     Handles PnL calculation, transaction costs, and performance metrics.
     """
     
+    # Fixed 4h candle cadence (6 candles/day * 365 days); a 1h or 1d backtester
+    # would override these
+    CANDLES_PER_YEAR = 6 * 365
+    SQRT_CANDLES_PER_YEAR = np.sqrt(CANDLES_PER_YEAR)
+    
     def __init__(self, initial_capital: float = 10000.0, fee_rate: float = 0.0005, idle_apy: float = 0.0):
         """
         Args:
@@ -18,6 +22,15 @@ class VectorizedBacktester:
         self.initial_capital = initial_capital
         self.fee_rate = fee_rate
         self.idle_apy = idle_apy
+    
+    @property
+    def yield_per_bar(self) -> float:
+        """
+        Per-candle yield on idle capital; exactly 0.0 when idle_apy is 0.
+        """
+        if self.idle_apy == 0.0:
+            return 0.0
+        return (1 + self.idle_apy) ** (1 / self.CANDLES_PER_YEAR) - 1
         
     def run(self, df: pd.DataFrame, signals: pd.Series, price_col: str = "close") -> dict:
         """
@@ -31,42 +44,84 @@ class VectorizedBacktester:
         Returns:
             dict: Performance metrics and equity curve
         """
-        # Align signals with price
-        data = df[[price_col]].copy()
-        data['signal'] = signals.shift(1).fillna(0) # Shift 1 to avoid lookahead bias
-        
-        # Calculate returns
-        data['returns'] = data[price_col].pct_change().fillna(0)
-        data['strategy_returns'] = data['returns'] * data['signal']
-        
-        # Calculate Idle Yield (Yield Farming / Funding Rate)
-        # We assume 6 candles per day (4h data) -> 2190 candles per year
-        candles_per_year = 6 * 365
-        yield_per_bar = (1 + self.idle_apy) ** (1 / candles_per_year) - 1
-        
-        # Apply yield when signal is 0 (Flat)
-        # Note: If we are partial size (e.g. 0.5), we should earn yield on the remaining 0.5.
-        # Logic: Yield on (1 - abs(signal))
-        data['idle_capital'] = (1 - data['signal'].abs()).clip(lower=0)
-        data['yield_returns'] = data['idle_capital'] * yield_per_bar
-        
-        # Calculate transaction costs
-        # Fee is paid on every position change
-        # position change = abs(current_signal - prev_signal)
-        # e.g., 0 -> 1 (Buy) = 1 unit turned over
-        # 1 -> -1 (Flip Short) = 2 units turned over
-        data['position_change'] = data['signal'].diff().abs().fillna(0)
-        data['fees'] = data['position_change'] * self.fee_rate
-        
-        # Net strategy returns
-        data['net_returns'] = data['strategy_returns'] + data['yield_returns'] - data['fees']
-        
-        # Equity curve
-        data['equity'] = self.initial_capital * (1 + data['net_returns']).cumprod()
-        data['buy_hold_equity'] = self.initial_capital * (1 + data['returns']).cumprod()
+        # The whole pipeline runs on raw arrays; the DataFrame is assembled once
+        # at the end for inspection and plotting
+        # Align signals with price; shift 1 to avoid lookahead bias
+        signal = signals.shift(1).fillna(0).reindex(df.index).to_numpy(dtype=np.float64)
+        
+        # Calculate returns (pct_change pads missing prices before differencing)
+        price = df[price_col].ffill().to_numpy(dtype=np.float64)
+        returns = np.zeros(len(price))
+        returns[1:] = price[1:] / price[:-1] - 1.0
+        returns[np.isnan(returns)] = 0.0
+        
+        # Never in the market and no idle yield (common for regime strategies on
+        # short folds): every strategy column is zero and equity stays flat, so
+        # skip the vector work and the return statistics
+        flat = self.yield_per_bar == 0.0 and not np.any(signal)
+        if flat:
+            zeros = np.zeros(len(price))
+            strategy_returns = yield_returns = position_change = fees = net_returns = zeros
+            idle_capital = np.ones(len(price))
+            equity = np.full(len(price), float(self.initial_capital))
+        else:
+            strategy_returns = returns * signal
+            
+            # Calculate Idle Yield (Yield Farming / Funding Rate)
+            # Apply yield when signal is 0 (Flat)
+            # Note: If we are partial size (e.g. 0.5), we should earn yield on the remaining 0.5.
+            # Logic: Yield on (1 - abs(signal))
+            idle_capital = np.clip(1.0 - np.abs(signal), 0.0, None)
+            yield_returns = idle_capital * self.yield_per_bar
+            
+            # Calculate transaction costs
+            # Fee is paid on every position change
+            # position change = abs(current_signal - prev_signal)
+            # e.g., 0 -> 1 (Buy) = 1 unit turned over
+            # 1 -> -1 (Flip Short) = 2 units turned over
+            position_change = np.abs(np.diff(signal, prepend=signal[:1]))
+            position_change[np.isnan(position_change)] = 0.0
+            fees = position_change * self.fee_rate
+            
+            # Net strategy returns
+            net_returns = strategy_returns + yield_returns - fees
+            
+            # Equity curve
+            # Like pandas cumprod, bars with a missing return (unaligned signals) stay
+            # NaN and are skipped by the running product
+            growth = 1.0 + net_returns
+            missing = np.isnan(growth)
+            equity = self.initial_capital * np.cumprod(np.where(missing, 1.0, growth))
+            equity[missing] = np.nan
+        
+        buy_hold_equity = self.initial_capital * np.cumprod(1.0 + returns)
+        
+        data = pd.DataFrame({
+            price_col: df[price_col],
+            'signal': signal,
+            'returns': returns,
+            'strategy_returns': strategy_returns,
+            'idle_capital': idle_capital,
+            'yield_returns': yield_returns,
+            'position_change': position_change,
+            'fees': fees,
+            'net_returns': net_returns,
+            'equity': equity,
+            'buy_hold_equity': buy_hold_equity,
+            'drawdown': zeros if flat else self._drawdown(equity)
+        }, index=df.index)
         
         # Compute metrics
-        metrics = self._compute_metrics(data['net_returns'], data['equity'])
+        if flat:
+            metrics = {
+                'total_return': 0.0,
+                'cagr': 0.0,
+                'sharpe_ratio': 0.0,
+                'max_drawdown': 0.0,
+                'volatility': 0.0
+            }
+        else:
+            metrics = self._compute_metrics(data['net_returns'], data['equity'], data['drawdown'].to_numpy())
         metrics['buy_hold_return'] = (data['buy_hold_equity'].iloc[-1] / self.initial_capital) - 1
         
         return {
@@ -74,25 +129,32 @@ class VectorizedBacktester:
             'data': data
         }
         
-    def _compute_metrics(self, returns: pd.Series, equity: pd.Series) -> dict:
+    @staticmethod
+    def _drawdown(equity: np.ndarray) -> np.ndarray:
+        """Fractional drawdown from the running equity peak"""
+        # fmax skips NaN bars like Series.cummax
+        rolling_max = np.fmax.accumulate(equity)
+        return (equity - rolling_max) / rolling_max
+        
+    def _compute_metrics(self, returns: pd.Series, equity: pd.Series, drawdown: np.ndarray | None = None) -> dict:
         """Compute CAGR, Sharpe, Drawdown, etc."""
         total_return = (equity.iloc[-1] / self.initial_capital) - 1
         
-        # Annualized metrics (assuming 4h data = 6 candles/day * 365 days = 2190 candles/year)
-        candles_per_year = 6 * 365
-        n_years = len(returns) / candles_per_year
+        # Annualized metrics (4h data = 2190 candles/year)
+        n_years = len(returns) / self.CANDLES_PER_YEAR
         
         cagr = (equity.iloc[-1] / self.initial_capital) ** (1 / n_years) - 1 if n_years > 0 else 0
         
         # Sharpe Ratio (assuming 0 risk-free rate for simplicity)
-        mean_ret = returns.mean() * candles_per_year
-        vol = returns.std() * np.sqrt(candles_per_year)
+        mean_ret = returns.mean() * self.CANDLES_PER_YEAR
+        vol = returns.std() * self.SQRT_CANDLES_PER_YEAR
         sharpe = mean_ret / vol if vol > 0 else 0
         
-        # Max Drawdown
-        rolling_max = equity.cummax()
-        drawdown = (equity - rolling_max) / rolling_max
-        max_drawdown = drawdown.min()
+        # Max Drawdown (reuses the curve from run when given)
+        if drawdown is None:
+            drawdown = self._drawdown(equity.to_numpy(dtype=np.float64))
+        valid = drawdown[~np.isnan(drawdown)]
+        max_drawdown = valid.min() if len(valid) else np.nan
         
         return {
             'total_return': total_return,
@@ -104,6 +166,9 @@ class VectorizedBacktester:
 
     def plot_results(self, result: dict, title: str = "Backtest Results"):
         """Plot Equity Curve and Drawdown"""
+        # Imported here so headless backtests and sweeps never load matplotlib
+        import matplotlib.pyplot as plt
+        
         data = result['data']
         
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True, gridspec_kw={'height_ratios': [3, 1]})
@@ -116,10 +181,8 @@ class VectorizedBacktester:
         ax1.legend()
         ax1.grid(True, alpha=0.3)
         
-        # Drawdown
-        rolling_max = data['equity'].cummax()
-        drawdown = (data['equity'] - rolling_max) / rolling_max
-        ax2.fill_between(data.index, drawdown, 0, color='red', alpha=0.3)
+        # Drawdown (computed once by run)
+        ax2.fill_between(data.index, data['drawdown'], 0, color='red', alpha=0.3)
         ax2.set_ylabel('Drawdown')
         ax2.set_xlabel('Date')
         ax2.grid(True, alpha=0.3)
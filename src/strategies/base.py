@@ -1,6 +1,43 @@
+import threading
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+# Active shared_regime_masks scope of this thread: (regimes, {regime_id: mask})
+_mask_scope = threading.local()
+
+def regime_mask(regimes: pd.Series, regime_id: int) -> np.ndarray:
+    """
+    Boolean array of the bars labelled `regime_id` (positionally aligned with regimes).
+    Inside a shared_regime_masks(regimes) scope each mask is computed once and
+    reused by every strategy.
+    """
+    scope = getattr(_mask_scope, 'active', None)
+    if scope is None or scope[0] is not regimes:
+        return (regimes == regime_id).to_numpy(dtype=np.bool_)
+    
+    masks = scope[1]
+    if regime_id not in masks:
+        masks[regime_id] = (regimes == regime_id).to_numpy(dtype=np.bool_)
+    return masks[regime_id]
+
+@contextmanager
+def shared_regime_masks(regimes: pd.Series, masks: dict | None = None):
+    """
+    Share regime_mask results for `regimes` across the strategies run inside the block.
+    The cache lives only for the block, so it never outlives (or goes stale on) the series.
+    Scopes are per thread: worker threads join an outer scope by passing the
+    dict it yields as `masks`.
+    """
+    if masks is None:
+        masks = {}
+    previous = getattr(_mask_scope, 'active', None)
+    _mask_scope.active = (regimes, masks)
+    try:
+        yield masks
+    finally:
+        _mask_scope.active = previous
 
 class BaseStrategy(ABC):
     """
@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
-from .base import BaseStrategy
+from .base import BaseStrategy, regime_mask
+from src.strategies._kernels import mean_reversion_positions, rolling_zscore, state_positions_np
+from src.utils.jit import NUMBA_AVAILABLE
 
 class MeanReversionStrategy(BaseStrategy):
     """
@@ -22,42 +24,29 @@ class MeanReversionStrategy(BaseStrategy):
         self.reversion_regime = reversion_regime
         
     def generate_signals(self, df: pd.DataFrame, regimes: pd.Series) -> pd.Series:
-        signals = pd.Series(0, index=df.index)
-        
         # Calculate Rolling Z-Score of Price
-        rolling_mean = df['close'].rolling(window=self.window).mean()
-        rolling_std = df['close'].rolling(window=self.window).std()
-        z_score = (df['close'] - rolling_mean) / rolling_std
+        if NUMBA_AVAILABLE:
+            # Mean and std from one online pass over close
+            z = rolling_zscore(df['close'].to_numpy(dtype=np.float64), self.window)
+        else:
+            rolling_mean = df['close'].rolling(window=self.window).mean()
+            rolling_std = df['close'].rolling(window=self.window).std()
+            z = ((df['close'] - rolling_mean) / rolling_std).to_numpy(dtype=np.float64)
         
         # Filter by Regime
-        is_reversion_regime = (regimes == self.reversion_regime)
-        
-        # We need to maintain state (long/short/flat) to handle exits
-        # This is harder to vectorize perfectly if exit is state-dependent (cross 0)
-        # But we can approximate vectorization or iterate
+        in_regime = regime_mask(regimes, self.reversion_regime)
         
-        # Iterative approach for correctness on exits
-        current_pos = 0
-        pos_history = []
+        # Exits depend on the current position (cross 0), so this is a state machine
+        # over bars; it runs as a compiled loop on raw arrays, or as the vectorized
+        # forward-fill equivalent when numba is unavailable
+        if NUMBA_AVAILABLE:
+            positions = mean_reversion_positions(z, in_regime, self.z_threshold)
+        else:
+            positions = state_positions_np(
+                in_regime & (z < -self.z_threshold),
+                in_regime & (z > self.z_threshold),
+                ~in_regime | (z >= 0),
+                ~in_regime | (z <= 0)
+            )
         
-        for i in range(len(df)):
-            if not is_reversion_regime.iloc[i]:
-                current_pos = 0 # Force exit if regime changes
-            else:
-                z = z_score.iloc[i]
-                
-                if current_pos == 0:
-                    if z < -self.z_threshold:
-                        current_pos = 1 # Long
-                    elif z > self.z_threshold:
-                        current_pos = -1 # Short
-                elif current_pos == 1:
-                    if z >= 0: # Exit condition
-                        current_pos = 0
-                elif current_pos == -1:
-                    if z <= 0: # Exit condition
-                        current_pos = 0
-            
-            pos_history.append(current_pos)
-            
-        return pd.Series(pos_history, index=df.index)
+        return pd.Series(positions, index=df.index)
@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
-from .base import BaseStrategy
+from .base import BaseStrategy, regime_mask
+from src.strategies._kernels import breakout_positions, state_positions_np
+from src.utils.jit import NUMBA_AVAILABLE
+from src.utils.rolling import rolling_max, rolling_mean, rolling_min
 
 class RegimeBreakoutStrategy(BaseStrategy):
     """
@@ -21,39 +24,27 @@ class RegimeBreakoutStrategy(BaseStrategy):
         self.breakout_regime = breakout_regime
         
     def generate_signals(self, df: pd.DataFrame, regimes: pd.Series) -> pd.Series:
-        signals = pd.Series(0, index=df.index)
+        # Donchian Channel, on raw arrays; the channel is shifted one bar by slicing
+        price = df['close'].to_numpy(dtype=np.float64)
+        upper = np.full(len(price), np.nan)
+        lower = np.full(len(price), np.nan)
+        upper[1:] = rolling_max(df['high'].to_numpy(dtype=np.float64), self.window)[:-1]
+        lower[1:] = rolling_min(df['low'].to_numpy(dtype=np.float64), self.window)[:-1]
+        mid = rolling_mean(price, self.window)
         
-        # Donchian Channel
-        rolling_max = df['high'].rolling(window=self.window).max().shift(1)
-        rolling_min = df['low'].rolling(window=self.window).min().shift(1)
-        rolling_mean = df['close'].rolling(window=self.window).mean()
+        in_regime = regime_mask(regimes, self.breakout_regime)
         
-        is_breakout_regime = (regimes == self.breakout_regime)
+        # Exits depend on the current position, so this is a state machine over
+        # bars; it runs as a compiled loop on raw arrays, or as the vectorized
+        # forward-fill equivalent when numba is unavailable
+        if NUMBA_AVAILABLE:
+            positions = breakout_positions(price, upper, lower, mid, in_regime)
+        else:
+            positions = state_positions_np(
+                in_regime & (price > upper),
+                in_regime & (price < lower),
+                ~in_regime | (price < mid), # Trailing stop at mean
+                ~in_regime | (price > mid)
+            )
         
-        current_pos = 0
-        pos_history = []
-        
-        for i in range(len(df)):
-            if not is_breakout_regime.iloc[i]:
-                current_pos = 0 # Force exit
-            else:
-                price = df['close'].iloc[i]
-                r_max = rolling_max.iloc[i]
-                r_min = rolling_min.iloc[i]
-                r_mean = rolling_mean.iloc[i]
-                
-                if current_pos == 0:
-                    if price > r_max:
-                        current_pos = 1
-                    elif price < r_min:
-                        current_pos = -1
-                elif current_pos == 1:
-                    if price < r_mean: # Trailing stop at mean
-                        current_pos = 0
-                elif current_pos == -1:
-                    if price > r_mean: # Trailing stop at mean
-                        current_pos = 0
-                        
-            pos_history.append(current_pos)
-            
-        return pd.Series(pos_history, index=df.index)
+        return pd.Series(positions, index=df.index)
@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
-from .base import BaseStrategy
+from .base import BaseStrategy, regime_mask
+from src.features._kernels import ewm_mean, wilder_adx
+from src.utils.jit import NUMBA_AVAILABLE
+from src.utils.rolling import rolling_mean
 
 class RobustTrendStrategy(BaseStrategy):
     """
@@ -23,14 +26,31 @@ class RobustTrendStrategy(BaseStrategy):
         self.long_only = long_only
         self.macro_trend_window = macro_trend_window
         
-    def generate_signals(self, df: pd.DataFrame, regimes: pd.Series) -> pd.Series:
+    def generate_signals(self, df: pd.DataFrame, regimes: pd.Series, adx: np.ndarray | None = None) -> pd.Series:
+        """
+        Args:
+            df: OHLCV data
+            regimes: Regime labels aligned with df
+            adx: Precomputed 14-bar ADX of df (e.g. compute_adx(df) from
+                src.features.trend, which uses the same smoothing). ADX does not
+                depend on the spans or threshold, so pass it when sweeping those
+                over the same df.
+        """
         # We need to rebuild indicators here or pass them in?
         # Ideally, strategies should calculate their own indicators to be self-contained
         # given the raw OHLCV.
         
+        # Indicators and conditions are built on raw arrays; the signal Series is
+        # created once at the end
+        close = df['close'].to_numpy(dtype=np.float64)
+        
         # 1. EMAs
-        ema_fast = df['close'].ewm(span=self.fast_span, adjust=False).mean()
-        ema_slow = df['close'].ewm(span=self.slow_span, adjust=False).mean()
+        if NUMBA_AVAILABLE:
+            ema_fast = ewm_mean(close, 2.0 / (self.fast_span + 1), False, 0)
+            ema_slow = ewm_mean(close, 2.0 / (self.slow_span + 1), False, 0)
+        else:
+            ema_fast = df['close'].ewm(span=self.fast_span, adjust=False).mean().to_numpy()
+            ema_slow = df['close'].ewm(span=self.slow_span, adjust=False).mean().to_numpy()
         
         # 2. ADX (Re-calculate here to be safe, or assume it's in df? Backtester passes raw df usually)
         # But wait, run_backtest passes `df` which might NOT have features if I loaded raw data.
@@ -39,11 +59,12 @@ class RobustTrendStrategy(BaseStrategy):
         # Let's re-calculate ADX using the helper we just wrote? 
         # Or duplicate logic. Duplicating is safer for standalone.
         
-        adx = self._compute_adx(df)
+        if adx is None:
+            adx = self._compute_adx(df).to_numpy()
         
         # 3. Macro Trend Filter (e.g. 200-day SMA = 1200 4h bars)
         if self.macro_trend_window > 0:
-            macro_ma = df['close'].rolling(window=self.macro_trend_window).mean()
+            macro_ma = rolling_mean(close, self.macro_trend_window)
             # If Price < Macro MA, we are in Bear Market -> Allow Shorts
             # If Price > Macro MA, we are in Bull Market -> Longs Only (typically safer)
             # Or we can use it to FILTER shorts.
@@ -52,19 +73,20 @@ class RobustTrendStrategy(BaseStrategy):
             # - Always allow Longs (if signal present)
             # - Allow Shorts ONLY if Price < Macro MA (Bear Market)
             
-            bear_market = df['close'] < macro_ma
+            bear_market = close < macro_ma
         else:
-            bear_market = pd.Series(True, index=df.index) # Always allow shorts if no filter
+            bear_market = True # Always allow shorts if no filter
         
         # 3. Logic
-        signals = pd.Series(0, index=df.index)
+        signals = np.zeros(len(close), dtype=np.int8) # Ternary, so int8
         
         # Vectorized conditions
-        long_cond = (ema_fast > ema_slow) & (adx > self.adx_threshold)
-        short_cond = (ema_fast < ema_slow) & (adx > self.adx_threshold)
+        trending = adx > self.adx_threshold
+        long_cond = (ema_fast > ema_slow) & trending
+        short_cond = (ema_fast < ema_slow) & trending
         
         # Filter by Regime
-        is_trend_regime = (regimes == self.trend_regime)
+        is_trend_regime = regime_mask(regimes, self.trend_regime)
         
         # Apply signals only in regime
         # If not in regime -> Flat (0)
@@ -80,17 +102,33 @@ class RobustTrendStrategy(BaseStrategy):
             # If macro_trend_window is set, bear_market is True only when below MA
             signals[is_trend_regime & short_cond & bear_market] = -1
         
-        return signals
+        return pd.Series(signals, index=df.index)
 
     def _compute_adx(self, df: pd.DataFrame, window: int = 14) -> pd.Series:
+        if NUMBA_AVAILABLE:
+            # The four Wilder EMAs run as compiled recursions on raw arrays
+            adx = wilder_adx(
+                df['high'].to_numpy(dtype=np.float64),
+                df['low'].to_numpy(dtype=np.float64),
+                df['close'].to_numpy(dtype=np.float64),
+                window
+            )
+            return pd.Series(adx, index=df.index)
+        
         high = df['high']
         low = df['low']
         close = df['close']
         
-        tr1 = high - low
-        tr2 = (high - close.shift(1)).abs()
-        tr3 = (low - close.shift(1)).abs()
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+        # True range on raw arrays: the previous close is a slice rather than a
+        # shifted Series, and fmax skips the NaN at the first bar like
+        # DataFrame.max(axis=1)
+        high_np = high.to_numpy(dtype=np.float64)
+        low_np = low.to_numpy(dtype=np.float64)
+        prev_close = np.empty(len(close))
+        prev_close[:1] = np.nan
+        prev_close[1:] = close.to_numpy(dtype=np.float64)[:-1]
+        tr_arr = np.fmax(np.fmax(high_np - low_np, np.abs(high_np - prev_close)), np.abs(low_np - prev_close))
+        tr = pd.Series(tr_arr, index=df.index)
         
         up_move = high - high.shift(1)
         down_move = low.shift(1) - low
@@ -1,6 +1,8 @@
 import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
-from .base import BaseStrategy
+from .base import BaseStrategy, shared_regime_masks
 
 class StrategySelector(BaseStrategy):
     """
@@ -17,8 +19,6 @@ class StrategySelector(BaseStrategy):
         self.strategies = strategies
         
     def generate_signals(self, df: pd.DataFrame, regimes: pd.Series) -> pd.Series:
-        final_signals = pd.Series(0, index=df.index)
-        
         # We assume strategies handle their own regime logic internally
         # But a selector could also strictly enforce it
         
@@ -26,8 +26,28 @@ class StrategySelector(BaseStrategy):
         # If they overlap, this might lead to leverage > 1 (e.g. 1 + 1 = 2)
         # For safety, we can clip to [-1, 1]
         
-        for strategy in self.strategies:
-            s_signals = strategy.generate_signals(df, regimes)
-            final_signals = final_signals + s_signals
+        # One stacked sum and clip on raw arrays rather than a Series add
+        # (allocation and index alignment) per strategy
+        # Children sharing a regime id reuse one mask
+        with shared_regime_masks(regimes) as masks:
+            def child_signals(strategy: BaseStrategy) -> np.ndarray:
+                # Worker threads join the same mask scope (scopes are per thread)
+                with shared_regime_masks(regimes, masks):
+                    return strategy.generate_signals(df, regimes).reindex(df.index).to_numpy()
+            
+            # Children are independent and read-only on df/regimes, and their
+            # Numba kernels release the GIL, so they run on a thread each
+            if len(self.strategies) > 1:
+                with ThreadPoolExecutor(max_workers=len(self.strategies)) as executor:
+                    arrs = list(executor.map(child_signals, self.strategies))
+            else:
+                arrs = [child_signals(strategy) for strategy in self.strategies]
             
-        return final_signals.clip(-1, 1)
+        # Accumulate in the children's own dtype (int8 for ternary signals) rather
+        # than NumPy's default int64 for small-integer sums
+        if arrs:
+            total = np.sum(arrs, axis=0, dtype=np.result_type(*arrs))
+        else:
+            total = np.zeros(len(df), dtype=np.int8)
+        
+        return pd.Series(np.clip(total, -1, 1), index=df.index)
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from .base import BaseStrategy
+from .base import BaseStrategy, regime_mask
 
 class RegimeTrendStrategy(BaseStrategy):
     """
@@ -20,20 +20,22 @@ class RegimeTrendStrategy(BaseStrategy):
         self.trend_regime = trend_regime
         
     def generate_signals(self, df: pd.DataFrame, regimes: pd.Series) -> pd.Series:
-        signals = pd.Series(0, index=df.index)
-        
         # Calculate Trend Indicator
-        ema = df['close'].ewm(span=self.ema_window, adjust=False).mean()
+        close = df['close']
+        ema = close.ewm(span=self.ema_window, adjust=False).mean()
         
         # Determine Trend Direction
-        trend_long = df['close'] > ema
-        trend_short = df['close'] < ema
+        trend_long = (close > ema).to_numpy()
+        trend_short = (close < ema).to_numpy()
         
         # Filter by Regime
-        is_trend_regime = (regimes == self.trend_regime)
+        is_trend_regime = regime_mask(regimes, self.trend_regime)
         
-        # Apply Logic
-        signals[is_trend_regime & trend_long] = 1
-        signals[is_trend_regime & trend_short] = -1
+        # Apply Logic in one branchless pass (int8: signals are ternary)
+        signals = np.select(
+            [is_trend_regime & trend_long, is_trend_regime & trend_short],
+            [np.int8(1), np.int8(-1)],
+            default=np.int8(0)
+        )
         
-        return signals
+        return pd.Series(signals, index=df.index)
@@ -0,0 +1,33 @@
+"""
+Optional Numba support.
+
+Exposes `njit`, `prange` and `NUMBA_AVAILABLE`. When numba is not installed,
+`njit` is a no-op decorator and `prange` is `range`, so jitted kernels still
+run as plain Python, and callers can check `NUMBA_AVAILABLE` to prefer a
+NumPy path instead.
+
+Kernels compiled with `cache=True` live in per-package `_kernels` modules that
+are only ever imported by their full `src.<package>._kernels` name, never
+relative or through the tests' `src`-less path. numba's on-disk cache records
+the defining module's name, so a kernel cached under another name (e.g.
+`features._kernels` from a test run) fails to load in the app.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """
+        Stand-in for numba.njit supporting both @njit and @njit(...).
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
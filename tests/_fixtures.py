@@ -0,0 +1,30 @@
+"""Shared synthetic inputs for the regime tests.
+
+Each generator is cached on its arguments, so the data is built once per
+session no matter how many test classes ask for it. The returned arrays are
+read-only; copy before mutating.
+"""
+import functools
+
+import numpy as np
+
+
+@functools.lru_cache(maxsize=None)
+def make_features(n=300, seed=0):
+    """(n, 2) float32 [close, volume] block with a high-vol regime in the middle."""
+    # One draw from a seeded Generator, one column per random input
+    Z = np.random.default_rng(seed).standard_normal((n, 3))
+    prices = np.cumsum(Z[:, 0])
+    vol = np.abs(1 + 0.2 * Z[:, 1])
+    vol[n // 2:n // 2 + n // 6] *= 3.0 # High-vol block
+    raw = np.column_stack([prices + 0.1 * Z[:, 2], vol * 1000]).astype(np.float32)
+    raw.setflags(write=False)
+    return raw
+
+
+@functools.lru_cache(maxsize=None)
+def make_hmm_inputs(n=200, seed=42):
+    """(n, 2) float32 block of independent standard normal features."""
+    raw = np.random.default_rng(seed).standard_normal((n, 2), dtype=np.float32)
+    raw.setflags(write=False)
+    return raw
@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from backtest.engine import BacktestEngine
+
+class TestBacktestEngine(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(42)
+        n = 300
+        dates = pd.date_range(start='2023-01-01', periods=n, freq='4h')
+        self.df = pd.DataFrame({
+            'close': 100 * np.exp(np.cumsum(np.random.normal(0, 0.01, n)))
+        }, index=dates)
+        self.signals = pd.DataFrame({
+            'long': np.ones(n),
+            'flat': np.zeros(n),
+            'mixed': np.random.choice([-1.0, 0.0, 0.5, 1.0], n)
+        }, index=dates)
+        self.engine = BacktestEngine(initial_capital=10000.0, fee_rate=0.0005, idle_apy=0.06)
+
+    def test_run_grid_matches_run(self):
+        grid = self.engine.run_grid(self.df, self.signals)
+        self.assertEqual(grid['equity'].shape, self.signals.shape)
+        self.assertEqual(list(grid['metrics'].index), list(self.signals.columns))
+        
+        for col in self.signals.columns:
+            single = self.engine.run(self.df, self.signals[col])
+            np.testing.assert_allclose(grid['equity'][col], single['data']['equity'])
+            for key, value in single['metrics'].items():
+                self.assertAlmostEqual(grid['metrics'].loc[col, key], value, places=10)
+
+    def test_missing_close_is_padded(self):
+        # A gap in the prices carries the move across it, like pct_change
+        df = self.df.copy()
+        df.iloc[[50, 51, 200], 0] = np.nan
+        expected = df['close'].ffill().pct_change().fillna(0)
+        
+        single = self.engine.run(df, self.signals['long'])
+        np.testing.assert_allclose(single['data']['returns'], expected)
+        
+        grid = self.engine.run_grid(df, self.signals)
+        np.testing.assert_allclose(grid['equity']['long'], single['data']['equity'])
+
+if __name__ == '__main__':
+    unittest.main()
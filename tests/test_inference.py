@@ -5,28 +5,26 @@ import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from regimes.inference import rolling_inference
+from _fixtures import make_features
 
 class TestRollingInference(unittest.TestCase):
-    def setUp(self):
-        np.random.seed(0)
-        n = 300
-        prices = np.cumsum(np.random.normal(0, 1, n))
-        vol = np.abs(np.random.normal(1, 0.2, n))
-        for i in range(150, 200):
-            vol[i] *= 3.0
-        df = pd.DataFrame({
-            "open": prices + np.random.normal(0, 0.1, n),
-            "high": prices + np.abs(np.random.normal(0, 0.3, n)),
-            "low": prices - np.abs(np.random.normal(0, 0.3, n)),
-            "close": prices + np.random.normal(0, 0.1, n),
-            "volume": vol * 1000
-        })
-        self.features = df[["close", "volume"]]
+    @classmethod
+    def setUpClass(cls):
+        # The data and the rolling fit are computed once for the class; the tests
+        # only assert on them. This is a smoke test (shapes, probabilities,
+        # labels), so a short window and few EM iterations suffice. Two PCA
+        # components keep the default PCA path, including the state sort, under
+        # test on the 2-column [close, volume] fixture, which is shared and
+        # read-only.
+        cls._raw = make_features(300, 0)
+        cls.features = pd.DataFrame(cls._raw, columns=["close", "volume"], copy=False)
+        cls.res = rolling_inference(cls.features, n_components=2, window=40, n_iter=5, smooth_alpha=0.2, n_pca_components=2, sort_by="volume")
 
     def test_output_shape_and_values(self):
-        res = rolling_inference(self.features, n_components=2, window=64, n_iter=25, smooth_alpha=0.2)
+        res = self.res
         self.assertEqual(len(res), len(self.features))
         self.assertTrue(all(col in res.columns for col in ["regime", "regime_proba_0", "regime_proba_1"]))
         valid_mask = res["regime"].notna()
@@ -37,10 +35,14 @@ class TestRollingInference(unittest.TestCase):
         self.assertTrue(set(res.loc[valid_mask, "regime"].astype(int).unique()).issubset({0, 1}))
 
     def test_invalid_inputs(self):
-        with self.assertRaises(ValueError):
-            rolling_inference(np.array([[1,2],[3,4]]), window=10)
-        with self.assertRaises(ValueError):
-            rolling_inference(self.features, window=1)
+        cases = [
+            ("ndarray input", np.array([[1,2],[3,4]]), 10),
+            ("window too small", self.features, 1),
+        ]
+        for case, features, window in cases:
+            with self.subTest(case=case):
+                with self.assertRaises(ValueError):
+                    rolling_inference(features, window=window)
 
 if __name__ == '__main__':
     unittest.main()
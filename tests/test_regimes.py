@@ -3,32 +3,41 @@ import numpy as np
 import pandas as pd
 import sys
 import os
+import copy
 import tempfile
 
 # Add src to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Kernels are imported by their src.* name (see src/utils/jit.py), so the repo
+# root is needed too
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from regimes.hmm import RegimeHMM
+from src.regimes._kernels import forward_filter_last
+from _fixtures import make_hmm_inputs
 
 class TestRegimeHMM(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         # Create synthetic data with structure
         # Regime 1: Mean 0, Low Vol
         # Regime 2: Mean 0, High Vol
         # Regime 3: Mean 0.5, Low Vol
-        np.random.seed(42)
+        # 2 independent features from the shared, read-only generator
+        cls._raw = make_hmm_inputs(200, 42)
         
-        n_samples = 200
-        # Create 2 features
-        X1 = np.random.normal(0, 1, n_samples)
-        X2 = np.random.normal(0, 1, n_samples)
+        cls.X = pd.DataFrame(cls._raw, columns=['f1', 'f2'], copy=False)
         
-        self.X = pd.DataFrame({'f1': X1, 'f2': X2})
-        self.hmm = RegimeHMM(n_components=2, n_iter=10)
+        # Fit once for the class; each test gets its own copy in setUp
+        cls._fitted = RegimeHMM(n_components=2, n_iter=3).fit(cls.X)
+        cls._states = cls._fitted.predict(cls.X)
+
+    def setUp(self):
+        self.hmm = copy.deepcopy(type(self)._fitted)
 
     def test_fit_and_predict(self):
-        # Test fitting
-        self.hmm.fit(self.X)
+        # Test fitting (done once in setUpClass)
         self.assertTrue(self.hmm._is_fitted)
         self.assertIsNotNone(self.hmm.model)
         
@@ -43,13 +52,32 @@ class TestRegimeHMM(unittest.TestCase):
         # Sum of probabilities should be close to 1
         np.testing.assert_allclose(probas.sum(axis=1), 1.0)
 
+    def test_warm_start_fit(self):
+        # Refit on a shifted window, seeded from the previous model
+        X_next = pd.concat([self.X.iloc[20:], self.X.iloc[:20]], ignore_index=True)
+        warm = RegimeHMM(n_components=2, n_iter=10).fit(X_next, init_from=self.hmm)
+        self.assertTrue(warm._is_fitted)
+
+        probas = warm.predict_proba(X_next)
+        self.assertEqual(probas.shape, (len(X_next), 2))
+        np.testing.assert_allclose(probas.sum(axis=1), 1.0)
+
+        # Mismatched number of states falls back to a cold start
+        cold = RegimeHMM(n_components=3, n_iter=10).fit(X_next, init_from=self.hmm)
+        self.assertTrue(cold._is_fitted)
+
+    def test_forward_filter_matches_last_posterior(self):
+        model = self.hmm.model
+        p_last = forward_filter_last(np.log(model.startprob_), np.log(model.transmat_), self.hmm.log_emissions(self.X))
+        np.testing.assert_allclose(p_last, self.hmm.predict_proba(self.X)[-1], atol=1e-10)
+
     def test_input_validation(self):
         # Test NaNs
         X_nan = self.X.copy()
         X_nan.iloc[0, 0] = np.nan
         
         with self.assertRaises(ValueError):
-            self.hmm.fit(X_nan)
+            RegimeHMM(n_components=2, n_iter=10).fit(X_nan)
             
         # Test Not Fitted Error
         model_new = RegimeHMM()
@@ -57,10 +85,10 @@ class TestRegimeHMM(unittest.TestCase):
             model_new.predict(self.X)
 
     def test_persistence(self):
-        self.hmm.fit(self.X)
-        
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            save_path = tmp.name
+        # Only the path is needed: close the descriptor so save() can reopen
+        # the file on any platform
+        fd, save_path = tempfile.mkstemp(suffix=".pkl")
+        os.close(fd)
             
         try:
             self.hmm.save(save_path)
@@ -71,10 +99,9 @@ class TestRegimeHMM(unittest.TestCase):
             self.assertEqual(loaded_hmm.n_components, self.hmm.n_components)
             
             # Check if predictions match
-            states_orig = self.hmm.predict(self.X)
             states_loaded = loaded_hmm.predict(self.X)
             
-            np.testing.assert_array_equal(states_orig, states_loaded)
+            np.testing.assert_array_equal(self._states, states_loaded)
             
         finally:
             if os.path.exists(save_path):